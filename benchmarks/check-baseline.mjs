@@ -0,0 +1,56 @@
+import { existsSync, readFileSync } from "fs";
+
+// Compare a `vitest bench --outputJson` run against the recorded baseline.
+// Fails when any benchmark's throughput (hz) drops by more than the threshold.
+//
+// Usage: node benchmarks/check-baseline.mjs [latest.json] [baseline.json]
+// BENCH_THRESHOLD sets the allowed drop as a fraction (default 0.25).
+
+const latestPath = process.argv[2] ?? "benchmarks/latest.json";
+const baselinePath = process.argv[3] ?? "benchmarks/baseline.json";
+const threshold = Number(process.env.BENCH_THRESHOLD ?? "0.25");
+
+const readResults = (path) => {
+	const report = JSON.parse(readFileSync(path, "utf8"));
+	const results = new Map();
+	for (const file of report.files ?? []) {
+		for (const group of file.groups ?? []) {
+			for (const benchmark of group.benchmarks ?? []) {
+				results.set(`${group.fullName} > ${benchmark.name}`, benchmark.hz);
+			}
+		}
+	}
+	return results;
+};
+
+// Without a baseline nothing can be compared, so a missing file fails the check
+if (!existsSync(baselinePath)) {
+	console.error(`No baseline at ${baselinePath}; record one with "npm run bench:baseline" and commit it.`);
+	process.exit(1);
+}
+
+const latest = readResults(latestPath);
+const baseline = readResults(baselinePath);
+const regressions = [];
+
+for (const [name, baselineHz] of baseline) {
+	const latestHz = latest.get(name);
+	if (latestHz === undefined) {
+		console.warn(`Missing from latest run: ${name}`);
+		continue;
+	}
+	const change = (latestHz - baselineHz) / baselineHz;
+	const line = `${(change * 100).toFixed(1).padStart(7)}%  ${name}`;
+	if (change < -threshold) {
+		regressions.push(line);
+	} else {
+		console.log(line);
+	}
+}
+
+if (regressions.length > 0) {
+	console.error(`\nThroughput regressed by more than ${threshold * 100}%:`);
+	regressions.forEach(line => console.error(line));
+	process.exit(1);
+}
+console.log(`\nNo regressions beyond ${threshold * 100}% (${baseline.size} benchmarks).`);
@@ -15,6 +15,7 @@ export default tseslint.config(
 			"esbuild.config.mjs",
 			"eslint.config.js",
 			"version-bump.mjs",
+			"benchmarks/**",
 			"versions.json",
 			"main.js",
 			".claude/**",
@@ -0,0 +1,90 @@
+// Shared inputs for the benchmark suite (`npm run bench`)
+import {TFile, Vault} from "obsidian";
+import {ContextCollector} from "../placeholders/context-collector";
+import {ExecutionContext} from "../types";
+
+/** Payload sizes benchmarked for every size-dependent path, in characters */
+export const PAYLOAD_SIZES: [label: string, length: number][] = [
+	["tiny", 64],
+	["1KB", 1024],
+	["100KB", 100 * 1024],
+	["1MB", 1024 * 1024],
+	["10MB", 10 * 1024 * 1024]
+];
+
+/** Number of command templates in a large but realistic configuration */
+export const TEMPLATE_COUNT = 40;
+
+// Source-like text with Unicode, emoji, newlines, quotes and shell metacharacters
+const SELECTION_SEED = [
+	"const greeting = \"Hello, 世界\";",
+	"// It's a `template` with $HOME, ${path} and 🚀",
+	"résumé — naïve café: \"quoted\" 'single' \\back\\slash",
+	"\r\n"
+].join("\n");
+
+/**
+ * Build a selection of the given length by repeating the seed text
+ */
+export function createSelection(length: number): string {
+	const text = SELECTION_SEED.repeat(Math.ceil(length / SELECTION_SEED.length)).slice(0, length);
+	// Do not end on half of a surrogate pair
+	const last = text.charCodeAt(text.length - 1);
+	return last >= 0xd800 && last <= 0xdbff ? text.slice(0, -1) : text;
+}
+
+/**
+ * Command templates similar to what users configure, cycling through placeholder mixes
+ */
+export function createCommandTemplates(count: number = TEMPLATE_COUNT): string[] {
+	const shapes = [
+		(i: number) => `copilot --agent <agent> -i "<prompt>" # ${i}`,
+		(i: number) => `opencode --agent <agent> --prompt "<prompt>" --cwd <dir> # ${i}`,
+		(i: number) => `claude "<prompt>" --add-dir <vault> --file <path> # ${i}`,
+		(i: number) => `aider --message '<selection>' <relative-path> # ${i}`
+	];
+	return Array.from({length: count}, (_, i) => shapes[i % shapes.length]?.(i) ?? "");
+}
+
+/**
+ * Prompt referencing nested placeholders, as saved in direct prompt history
+ */
+export const PROMPT_TEMPLATE = "Review <file> in <dir> and explain this selection:\n<selection>";
+
+/**
+ * Context collector backed by fixed paths, so benchmarks measure resolution only
+ */
+export function createContextCollector(): ContextCollector {
+	return {
+		getVaultPath: () => "C:\\obsidian\\vault",
+		getFilePath: () => "C:\\obsidian\\vault\\notes\\Welcome.md",
+		getRelativePath: () => "notes/Welcome.md",
+		getDirectoryPath: () => "C:\\obsidian\\vault\\notes"
+	} as unknown as ContextCollector;
+}
+
+/**
+ * Execution context for a note with the given selection
+ */
+export function createContext(selection: string): ExecutionContext {
+	const file = new TFile();
+	file.name = "Welcome.md";
+	file.path = "notes/Welcome.md";
+	return {
+		file,
+		vault: new Vault(),
+		selection,
+		agent: "Build"
+	};
+}
+
+/**
+ * Multi-megabyte inputs run a fixed sample count instead of a time budget, so a full run
+ * stays within a few minutes. It is large enough that their throughput is stable under
+ * the same regression threshold as the smaller inputs.
+ */
+export function getBenchOptions(length: number): {time: number; iterations: number; warmupIterations: number} {
+	return length >= 1024 * 1024
+		? {time: 0, iterations: 30, warmupIterations: 3}
+		: {time: 500, iterations: 10, warmupIterations: 5};
+}
@@ -146,34 +146,80 @@ class ToggleComponent {
 	}
 }
 
-export class TFile {
-	name: string;
-	path: string;
+export class TAbstractFile {
+	name = "";
+	path = "";
+}
 
-	constructor() {
-		this.name = "";
-		this.path = "";
-	}
+export class TFile extends TAbstractFile {
+	extension = "md";
+	stat = {ctime: 0, mtime: 0, size: 0};
+}
+
+export class TFolder extends TAbstractFile {
+	children: TAbstractFile[] = [];
 }
 
 export class Vault {
+	configDir = ".obsidian";
+
 	getName(): string {
 		return "TestVault";
 	}
+
+	cachedRead(file: TFile): Promise<string> {
+		return Promise.resolve("");
+	}
+
+	on(): any {
+		return {};
+	}
+}
+
+export class MetadataCache {
+	resolvedLinks: Record<string, Record<string, number>> = {};
+
+	getFileCache(file: TFile): any {
+		return null;
+	}
+
+	on(): any {
+		return {};
+	}
 }
 
+export const getAllTags = (cache: any): string[] | null => {
+	const tags: string[] = (cache?.tags ?? []).map((tag: {tag: string}) => tag.tag);
+	const frontmatterTags = cache?.frontmatter?.tags;
+	if (Array.isArray(frontmatterTags)) {
+		tags.push(...frontmatterTags.map((tag: string) => `#${tag}`));
+	}
+	return tags;
+};
+
 export class Notice {
-	constructor(message: string) {
+	noticeEl: HTMLElement | undefined = typeof document !== "undefined" ? document.createElement("div") : undefined;
+
+	constructor(message: string, duration?: number) {
 		console.log(`Notice: ${message}`);
 	}
+
+	setMessage(message: string): this {
+		console.log(`Notice: ${message}`);
+		return this;
+	}
+
+	hide(): void {}
 }
 
 export class App {
 	workspace: any;
 	vault: Vault;
+	metadataCache: MetadataCache;
 
 	constructor() {
 		this.vault = new Vault();
+		this.metadataCache = new MetadataCache();
 		this.workspace = { on: () => ({}) };
 	}
 }
@@ -236,15 +282,34 @@ export class MarkdownView {
 export class Plugin {
 	app: any;
 	manifest: any;
+	commands: any[] = [];
+
+	constructor(app?: any, manifest?: any) {
+		this.app = app;
+		this.manifest = manifest;
+	}
+
 	loadData(): Promise<any> {
 		return Promise.resolve({});
 	}
 	saveData(data: any): Promise<void> {
 		return Promise.resolve();
 	}
+	addCommand(command: any): any {
+		this.commands.push(command);
+		return command;
+	}
+	removeCommand(id: string): void {
+		this.commands = this.commands.filter(command => command.id !== id);
+	}
+	addSettingTab(tab: any): void {}
+	register(callback: () => any): void {}
+	registerEvent(eventRef: any): void {}
 }
 
-export class PluginSettingTab {}
+export class PluginSettingTab {
+	hide(): void {}
+}
 
 export class Setting {
 	settingEl: HTMLElement & {addClass?: (cls: string) => void};
@@ -0,0 +1,17 @@
+// Shared inputs for the unit tests (`npm test`)
+import {CommandTemplate} from "../types";
+
+/** Id of the first default agent, referenced by test command templates */
+export const TEST_AGENT_ID = "00000000-0000-4000-8000-000000000001";
+
+/**
+ * Build an enabled command template; override only the fields a test depends on
+ */
+export const createCommand = (id: string, overrides: Partial<CommandTemplate> = {}): CommandTemplate => ({
+	id,
+	name: `Command ${id}`,
+	template: "copilot -i <prompt>",
+	enabled: true,
+	agentId: TEST_AGENT_ID,
+	...overrides
+});
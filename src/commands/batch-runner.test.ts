@@ -0,0 +1,164 @@
+// @vitest-environment jsdom
+import {afterEach, beforeEach, describe, expect, it, vi} from "vitest";
+import {App, TFile, TFolder} from "obsidian";
+import {BatchRunner, collectMarkdownFiles} from "./batch-runner";
+import {ScheduledResult} from "./batch-scheduler";
+import {BatchSummaryModal} from "../ui/batch-summary-modal";
+import {TemplateCompiler} from "../placeholders/template-compiler";
+import {createDefaultSettings} from "../settings";
+import {AITerminalSettings, CommandTemplate} from "../types";
+import {createCommand} from "../__tests__/fixtures";
+
+const createFile = (path: string, extension = "md"): TFile => {
+	const file = new TFile();
+	file.path = path;
+	file.extension = extension;
+	return file;
+};
+
+const createFolder = (children: (TFile | TFolder)[]): TFolder => {
+	const folder = new TFolder();
+	folder.children = children;
+	return folder;
+};
+
+const flush = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe("collectMarkdownFiles", () => {
+	it("expands folders recursively and keeps only markdown files", () => {
+		const a = createFile("notes/a.md");
+		const b = createFile("notes/deep/b.md");
+		const image = createFile("notes/image.png", "png");
+		const folder = createFolder([a, image, createFolder([b])]);
+
+		expect(collectMarkdownFiles([folder])).toEqual([a, b]);
+	});
+
+	it("lists a file once when it is selected together with its folder", () => {
+		const a = createFile("notes/a.md");
+		const folder = createFolder([a]);
+
+		expect(collectMarkdownFiles([a, folder, a])).toEqual([a]);
+	});
+});
+
+describe("BatchRunner", () => {
+	let executor: {launchCommand: ReturnType<typeof vi.fn>; executeCommand: ReturnType<typeof vi.fn>};
+	let runner: BatchRunner;
+	let summaries: ScheduledResult<TFile>[][];
+	let settings: AITerminalSettings;
+
+	beforeEach(() => {
+		summaries = [];
+		vi.spyOn(BatchSummaryModal.prototype, "open").mockImplementation(function (this: BatchSummaryModal) {
+			summaries.push((this as unknown as {results: ScheduledResult<TFile>[]}).results);
+		});
+		vi.spyOn(console, "log").mockImplementation(() => {});
+		vi.spyOn(console, "error").mockImplementation(() => {});
+
+		executor = {
+			launchCommand: vi.fn(async () => ({})),
+			executeCommand: vi.fn(async () => true)
+		};
+		settings = {...createDefaultSettings(), batchConcurrency: 2, batchLaunchIntervalMs: 0};
+		const plugin = {app: new App(), settings, templateCompiler: new TemplateCompiler()};
+		runner = new BatchRunner(plugin as any, executor as any);
+	});
+
+	afterEach(() => {
+		vi.restoreAllMocks();
+	});
+
+	it("launches once per file and shows a summary", async () => {
+		const files = [createFile("a.md"), createFile("b.md"), createFile("c.md")];
+		executor.launchCommand.mockImplementation(async (_command: CommandTemplate, context: {file: TFile}) => {
+			await flush();
+			if (context.file.path === "b.md") {
+				throw new Error("spawn failed");
+			}
+			return {};
+		});
+
+		await runner.run(createCommand("review", {template: "claude <file>"}), files);
+
+		expect(executor.launchCommand).toHaveBeenCalledTimes(3);
+		expect(summaries).toHaveLength(1);
+		expect(summaries[0]?.map(result => result.status)).toEqual(["fulfilled", "rejected", "fulfilled"]);
+		expect(runner.isRunning()).toBe(false);
+	});
+
+	it("starts the next file only when a running agent exits", async () => {
+		const files = [createFile("a.md"), createFile("b.md"), createFile("c.md")];
+		const exits: (() => void)[] = [];
+		executor.launchCommand.mockImplementation(async () => ({
+			exited: new Promise<void>(resolve => exits.push(resolve))
+		}));
+
+		const done = runner.run(createCommand("review", {template: "claude <file>"}), files);
+		await flush();
+		expect(executor.launchCommand).toHaveBeenCalledTimes(2);
+
+		exits[0]?.();
+		await flush();
+		expect(executor.launchCommand).toHaveBeenCalledTimes(3);
+
+		exits.slice(1).forEach(exit => exit());
+		await done;
+		expect(summaries[0]?.map(result => result.status)).toEqual(["fulfilled", "fulfilled", "fulfilled"]);
+	});
+
+	it("does not wait for running agents after cancelling", async () => {
+		const files = [createFile("a.md"), createFile("b.md"), createFile("c.md")];
+		executor.launchCommand.mockImplementation(async () => ({exited: new Promise<void>(() => {})}));
+
+		const done = runner.run(createCommand("review", {template: "claude <file>"}), files);
+		await flush();
+		runner.cancel();
+		await done;
+
+		expect(executor.launchCommand).toHaveBeenCalledTimes(2);
+		expect(summaries[0]?.map(result => result.status)).toEqual(["fulfilled", "fulfilled", "cancelled"]);
+	});
+
+	it("launches manifest commands once for the whole batch", async () => {
+		const files = [createFile("a.md"), createFile("b.md")];
+		const command = createCommand("review", {template: "claude --files <manifest-file>"});
+
+		await runner.run(command, files);
+
+		expect(executor.executeCommand).toHaveBeenCalledTimes(1);
+		expect(executor.executeCommand).toHaveBeenCalledWith(command, {batchFiles: files});
+		expect(executor.launchCommand).not.toHaveBeenCalled();
+	});
+
+	it("does nothing without markdown files", async () => {
+		await runner.run(createCommand("review", {template: "claude <file>"}), []);
+
+		expect(executor.launchCommand).not.toHaveBeenCalled();
+		expect(summaries).toHaveLength(0);
+	});
+
+	it("refuses a second batch and cancels the remaining launches", async () => {
+		const command = createCommand("review", {template: "claude <file>"});
+		const files = [createFile("a.md"), createFile("b.md"), createFile("c.md")];
+		settings.batchConcurrency = 1;
+		let releaseFirst: () => void = () => {};
+		executor.launchCommand.mockImplementationOnce(() => new Promise<object>(resolve => {
+			releaseFirst = () => resolve({});
+		}));
+
+		const first = runner.run(command, files);
+		await flush();
+		expect(runner.isRunning()).toBe(true);
+
+		await runner.run(command, [createFile("d.md")]);
+		expect(executor.launchCommand).toHaveBeenCalledTimes(1);
+
+		runner.cancel();
+		releaseFirst();
+		await first;
+
+		expect(summaries[0]?.map(result => result.status)).toEqual(["fulfilled", "cancelled", "cancelled"]);
+		expect(runner.isRunning()).toBe(false);
+	});
+});
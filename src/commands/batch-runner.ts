@@ -0,0 +1,131 @@
+import {Notice, TAbstractFile, TFile, TFolder} from "obsidian";
+import AITerminalPlugin from "../main";
+import {CommandTemplate} from "../types";
+import {CommandExecutor} from "./command-executor";
+import {runScheduled} from "./batch-scheduler";
+import {BatchSummaryModal} from "../ui/batch-summary-modal";
+
+/**
+ * Expand files and folders into a de-duplicated list of markdown files
+ */
+export const collectMarkdownFiles = (items: TAbstractFile[]): TFile[] => {
+	const files = new Map<string, TFile>();
+	const visit = (item: TAbstractFile) => {
+		if (item instanceof TFolder) {
+			item.children.forEach(visit);
+		} else if (item instanceof TFile && item.extension === "md") {
+			files.set(item.path, item);
+		}
+	};
+	items.forEach(visit);
+	return Array.from(files.values());
+};
+
+/**
+ * Runs a command template across many files
+ */
+export class BatchRunner {
+	private controller?: AbortController;
+
+	constructor(
+		private plugin: AITerminalPlugin,
+		private executor: CommandExecutor
+	) {}
+
+	/**
+	 * Whether a batch is currently running
+	 */
+	isRunning(): boolean {
+		return this.controller !== undefined;
+	}
+
+	/**
+	 * Stop starting new launches for the running batch
+	 */
+	cancel(): void {
+		this.controller?.abort();
+	}
+
+	/**
+	 * Whether the command passes the whole batch to one process via <manifest-file>
+	 */
+	usesManifest(command: CommandTemplate): boolean {
+		const compiler = this.plugin.templateCompiler;
+		return compiler.compile(command.template).placeholders.has("manifest-file")
+			|| compiler.compile(command.defaultPrompt ?? "").placeholders.has("manifest-file");
+	}
+
+	/**
+	 * Launch the command once with a manifest, or once per file through the scheduler
+	 */
+	async run(command: CommandTemplate, files: TFile[]): Promise<void> {
+		if (files.length === 0) {
+			new Notice("No markdown files to process.");
+			return;
+		}
+
+		if (this.usesManifest(command)) {
+			await this.executor.executeCommand(command, {batchFiles: files});
+			return;
+		}
+
+		if (this.controller) {
+			new Notice("A batch is already running. Cancel it before starting another.");
+			return;
+		}
+
+		const controller = new AbortController();
+		this.controller = controller;
+		const total = files.length;
+		const notice = new Notice(this.formatProgress(command, 0, total), 0);
+		// Clicking the progress notice dismisses it and cancels the batch
+		notice.noticeEl?.addEventListener("click", () => controller.abort());
+
+		try {
+			const results = await runScheduled(
+				files,
+				file => this.launchAndWait(command, file, controller.signal),
+				{
+					concurrency: this.plugin.settings.batchConcurrency,
+					minIntervalMs: this.plugin.settings.batchLaunchIntervalMs,
+					signal: controller.signal,
+					onSettled: settled => notice.setMessage(this.formatProgress(command, settled, total))
+				}
+			);
+			notice.hide();
+
+			results.forEach(result => {
+				if (result.status === "rejected") {
+					console.error(`[AI Terminal] Batch launch failed for ${result.item.path}: ${result.error}`);
+				}
+			});
+			new BatchSummaryModal(this.plugin.app, command.name, results).open();
+		} finally {
+			this.controller = undefined;
+		}
+	}
+
+	/**
+	 * Launch the command for one file and hold its scheduler slot until the agent exits.
+	 * Windows Terminal launches cannot be observed and release the slot right away;
+	 * cancelling releases every slot without waiting for running agents.
+	 */
+	private async launchAndWait(command: CommandTemplate, file: TFile, signal: AbortSignal): Promise<void> {
+		const {exited} = await this.executor.launchCommand(command, {file});
+		if (!exited || signal.aborted) {
+			return;
+		}
+		await new Promise<void>(resolve => {
+			const done = () => {
+				signal.removeEventListener("abort", done);
+				resolve();
+			};
+			signal.addEventListener("abort", done);
+			void exited.then(done);
+		});
+	}
+
+	private formatProgress(command: CommandTemplate, settled: number, total: number): string {
+		return `${command.name}: ${settled}/${total} files processed (click to cancel)`;
+	}
+}
@@ -0,0 +1,56 @@
+import {describe, expect, it} from "vitest";
+import {runScheduled} from "./batch-scheduler";
+
+const flush = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe("runScheduled", () => {
+	it("never runs more tasks than the concurrency cap", async () => {
+		let running = 0;
+		let peak = 0;
+		const results = await runScheduled([1, 2, 3, 4, 5], async () => {
+			running += 1;
+			peak = Math.max(peak, running);
+			await flush();
+			running -= 1;
+		}, {concurrency: 2, minIntervalMs: 0});
+
+		expect(peak).toBe(2);
+		expect(results.every(result => result.status === "fulfilled")).toBe(true);
+	});
+
+	it("spaces task starts by the launch interval", async () => {
+		const starts: number[] = [];
+		await runScheduled([1, 2, 3], async () => {
+			starts.push(Date.now());
+		}, {concurrency: 3, minIntervalMs: 20});
+
+		expect(starts).toHaveLength(3);
+		expect((starts[2] ?? 0) - (starts[0] ?? 0)).toBeGreaterThanOrEqual(35);
+	});
+
+	it("reports failures per item and keeps going", async () => {
+		const settled: number[] = [];
+		const results = await runScheduled(["a", "b"], async item => {
+			if (item === "a") {
+				throw new Error("boom");
+			}
+		}, {concurrency: 1, minIntervalMs: 0, onSettled: count => settled.push(count)});
+
+		expect(results).toEqual([
+			{item: "a", status: "rejected", error: "boom"},
+			{item: "b", status: "fulfilled"}
+		]);
+		expect(settled).toEqual([1, 2]);
+	});
+
+	it("marks items that never started as cancelled", async () => {
+		const controller = new AbortController();
+		const results = await runScheduled([1, 2, 3], async item => {
+			if (item === 1) {
+				controller.abort();
+			}
+		}, {concurrency: 1, minIntervalMs: 0, signal: controller.signal});
+
+		expect(results.map(result => result.status)).toEqual(["fulfilled", "cancelled", "cancelled"]);
+	});
+});
@@ -0,0 +1,87 @@
+/**
+ * Outcome of one scheduled task
+ */
+export type ScheduledResult<T> =
+	| { item: T; status: "fulfilled" }
+	| { item: T; status: "rejected"; error: string }
+	| { item: T; status: "cancelled" };
+
+export interface ScheduleOptions {
+	/** Maximum number of tasks running at once */
+	concurrency: number;
+
+	/** Minimum delay between task starts, in milliseconds */
+	minIntervalMs: number;
+
+	/** Stops starting new tasks when aborted */
+	signal?: AbortSignal;
+
+	/** Called after each task settles */
+	onSettled?: (settled: number, total: number) => void;
+}
+
+const delay = (ms: number, signal?: AbortSignal): Promise<void> => new Promise(resolve => {
+	const done = () => {
+		clearTimeout(timer);
+		signal?.removeEventListener("abort", done);
+		resolve();
+	};
+	const timer = setTimeout(done, ms);
+	signal?.addEventListener("abort", done);
+});
+
+/**
+ * Run a task for each item with a concurrency cap and a start-rate limit.
+ * Items that never started because of cancellation are reported as cancelled.
+ *
+ * @param items Items to process, in start order.
+ * @param task Async task run for each item; a rejection marks the item as failed.
+ * @param options Scheduling limits, cancellation and progress callback.
+ * @returns One result per item, in item order.
+ */
+export const runScheduled = async <T>(
+	items: T[],
+	task: (item: T) => Promise<void>,
+	options: ScheduleOptions
+): Promise<ScheduledResult<T>[]> => {
+	const {signal, onSettled} = options;
+	const concurrency = Math.max(1, Math.floor(options.concurrency));
+	const minIntervalMs = Math.max(0, options.minIntervalMs);
+	const results: (ScheduledResult<T> | undefined)[] = new Array(items.length);
+	let nextIndex = 0;
+	let nextStartAt = 0;
+	let settled = 0;
+
+	const worker = async (): Promise<void> => {
+		while (nextIndex < items.length && !signal?.aborted) {
+			const index = nextIndex++;
+			const item = items[index] as T;
+
+			// Reserve the next start slot before waiting so workers stay spaced out
+			const now = Date.now();
+			const startAt = Math.max(now, nextStartAt);
+			nextStartAt = startAt + minIntervalMs;
+			if (startAt > now) {
+				await delay(startAt - now, signal);
+			}
+			if (signal?.aborted) {
+				return;
+			}
+
+			try {
+				await task(item);
+				results[index] = {item, status: "fulfilled"};
+			} catch (error) {
+				const message = error instanceof Error ? error.message : String(error);
+				results[index] = {item, status: "rejected", error: message};
+			}
+			settled += 1;
+			onSettled?.(settled, items.length);
+		}
+	};
+
+	const workerCount = Math.min(concurrency, items.length);
+	await Promise.all(Array.from({length: workerCount}, () => worker()));
+
+	return items.map((item, index) => results[index] ?? {item, status: "cancelled"});
+};
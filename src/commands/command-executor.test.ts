@@ -0,0 +1,161 @@
+import {afterEach, beforeEach, describe, expect, it, vi} from "vitest";
+import fs from "fs";
+import os from "os";
+import path from "path";
+import {App, TFile} from "obsidian";
+import {CommandExecutor} from "./command-executor";
+import {TerminalLauncher} from "../terminal/terminal-launcher";
+import {TemplateCompiler} from "../placeholders/template-compiler";
+import {NoteContextCache} from "../placeholders/note-context-cache";
+import {LaunchMetrics} from "../metrics/launch-metrics";
+import {SettingsStore} from "../settings-store";
+import {createDefaultSettings} from "../settings";
+import {AITerminalSettings, PayloadKind} from "../types";
+import {createCommand} from "../__tests__/fixtures";
+
+const createFile = (filePath: string): TFile => {
+	const file = new TFile();
+	file.path = filePath;
+	file.name = path.basename(filePath);
+	return file;
+};
+
+describe("CommandExecutor payloads", () => {
+	let vaultDir: string;
+	let payloadDir: string;
+	let settings: AITerminalSettings;
+	let app: any;
+	let executor: CommandExecutor;
+	let launch: ReturnType<typeof vi.spyOn>;
+
+	beforeEach(() => {
+		vaultDir = fs.mkdtempSync(path.join(os.tmpdir(), "ai-terminal-vault-"));
+		payloadDir = path.join(vaultDir, "plugin", "payloads");
+		settings = {...createDefaultSettings(), terminalType: "bash"};
+
+		app = new App();
+		app.vault.adapter = {getBasePath: () => vaultDir};
+		const plugin = {
+			app,
+			settings,
+			manifest: {id: "ai-terminal", dir: "plugin"},
+			settingsStore: new SettingsStore(() => settings, async () => {}),
+			templateCompiler: new TemplateCompiler(),
+			noteContextCache: new NoteContextCache(),
+			launchMetrics: new LaunchMetrics()
+		};
+		executor = new CommandExecutor(plugin as any);
+		launch = vi.spyOn(TerminalLauncher.prototype, "launch").mockResolvedValue({spawnMs: 0});
+		vi.spyOn(console, "log").mockImplementation(() => {});
+	});
+
+	afterEach(() => {
+		vi.restoreAllMocks();
+		fs.rmSync(vaultDir, {recursive: true, force: true});
+	});
+
+	const getLaunchedCommand = (): string => launch.mock.calls[0]?.[1] as string;
+
+	const readPayloads = (kind: PayloadKind): string[] => {
+		if (!fs.existsSync(payloadDir)) {
+			return [];
+		}
+		return fs.readdirSync(payloadDir)
+			.filter(name => name.startsWith(`${kind}-`))
+			.map(name => fs.readFileSync(path.join(payloadDir, name), "utf8"));
+	};
+
+	describe("manifest", () => {
+		it("lists every batch file", async () => {
+			const command = createCommand("review", {template: "claude --files <manifest-file>"});
+
+			await executor.launchCommand(command, {batchFiles: [createFile("a.md"), createFile("notes/b.md")]});
+
+			expect(readPayloads("manifest")).toEqual([`${vaultDir}/a.md\n${vaultDir}/notes/b.md`]);
+		});
+
+		it("lists the active note when run outside a batch", async () => {
+			const command = createCommand("review", {template: "claude --files <manifest-file>"});
+
+			await executor.launchCommand(command, {file: createFile("notes/a.md")});
+
+			expect(readPayloads("manifest")).toEqual([`${vaultDir}/notes/a.md`]);
+		});
+	});
+
+	describe("offloading", () => {
+		beforeEach(() => {
+			settings.payloadOffloadThreshold = 10;
+		});
+
+		it("passes values up to the threshold inline and offloads longer ones", async () => {
+			const command = createCommand("review", {template: "claude <selection>"});
+
+			await executor.launchCommand(command, {selection: "a".repeat(10)});
+			expect(readPayloads("selection")).toEqual([]);
+			expect(getLaunchedCommand()).toBe(`claude '${"a".repeat(10)}'`);
+
+			launch.mockClear();
+			await executor.launchCommand(command, {selection: "b".repeat(11)});
+			expect(readPayloads("selection")).toEqual(["b".repeat(11)]);
+			expect(getLaunchedCommand()).toMatch(/^claude "\$\(cat '.+selection-.+\.txt'\)"$/);
+		});
+
+		it("keeps placeholders embedded in other text inline", async () => {
+			const command = createCommand("review", {template: "claude 'Review: <selection>'"});
+
+			await executor.launchCommand(command, {selection: "b".repeat(11)});
+
+			expect(readPayloads("selection")).toEqual([]);
+			expect(getLaunchedCommand()).toContain("b".repeat(11));
+		});
+
+		it("never offloads when the threshold is 0", async () => {
+			settings.payloadOffloadThreshold = 0;
+			const command = createCommand("review", {template: "claude <selection>"});
+
+			await executor.launchCommand(command, {selection: "b".repeat(100)});
+
+			expect(readPayloads("selection")).toEqual([]);
+		});
+
+		it("writes the rendered prompt for <prompt-file> regardless of size", async () => {
+			settings.payloadOffloadThreshold = 0;
+			const command = createCommand("review", {
+				template: "claude --prompt-file <prompt-file>",
+				defaultPrompt: "Summarize"
+			});
+
+			await executor.launchCommand(command, {});
+
+			const [prompt] = fs.readdirSync(payloadDir);
+			expect(readPayloads("prompt")).toEqual(["Summarize"]);
+			expect(getLaunchedCommand()).toBe(`claude --prompt-file '${path.join(payloadDir, prompt ?? "")}'`);
+		});
+
+		it("offloads oversized rich note values", async () => {
+			const file = createFile("notes/a.md");
+			app.vault.cachedRead = vi.fn(async () => "# Long note body");
+			const command = createCommand("review", {template: "claude <content>"});
+
+			await executor.launchCommand(command, {file});
+
+			expect(readPayloads("content")).toEqual(["# Long note body"]);
+			expect(getLaunchedCommand()).toContain("$(cat ");
+		});
+
+		it("warns when an offloaded value is still too large for one argument", async () => {
+			const logs: string[] = [];
+			vi.mocked(console.log).mockImplementation((message: string) => {
+				logs.push(message);
+			});
+			const command = createCommand("review", {template: "claude <selection>"});
+
+			await executor.launchCommand(command, {selection: "c".repeat(100)});
+			expect(logs.some(message => message.includes("too large to pass"))).toBe(false);
+
+			await executor.launchCommand(command, {selection: "c".repeat(2 * 1024 * 1024)});
+			expect(logs.some(message => message.includes("<selection>") && message.includes("too large to pass"))).toBe(true);
+		});
+	});
+});
@@ -1,10 +1,34 @@
 import {Notice} from "obsidian";
 import AITerminalPlugin from "../main";
-import {CommandTemplate, ExecutionContext} from "../types";
+import {CommandTemplate, ExecutionContext, PayloadFiles, PlatformType, RICH_PLACEHOLDERS} from "../types";
 import {ContextCollector} from "../placeholders/context-collector";
 import {PlaceholderResolver} from "../placeholders/placeholder-resolver";
 import {TerminalLauncher} from "../terminal/terminal-launcher";
 import {resolveShellType} from "../terminal/shell-selector";
+import {exceedsArgumentLimit, PayloadOffloader} from "../terminal/payload-offloader";
+import {ShellSessionPool} from "../terminal/shell-session-pool";
+import {LaunchPhase, LaunchRecord} from "../metrics/launch-metrics";
+
+/**
+ * Validation failure whose message is shown to the user as-is
+ */
+export class CommandExecutionError extends Error {}
+
+/**
+ * A command handed to the terminal
+ */
+export interface LaunchedCommand {
+	/** Resolves when the shell running the agent exits; undefined where that cannot be observed (Windows Terminal) */
+	exited?: Promise<void>;
+}
+
+interface ReferencedPlaceholders {
+	template: Set<string>;
+	prompt: Set<string>;
+
+	/** Template placeholders that are whole shell arguments and can be read from a file */
+	standalone: Set<string>;
+}
 
 /**
  * Orchestrates command execution
@@ -13,11 +37,18 @@ export class CommandExecutor {
 	private contextCollector: ContextCollector;
 	private placeholderResolver: PlaceholderResolver;
 	private terminalLauncher: TerminalLauncher;
+	private payloadOffloader: PayloadOffloader;
+	/** Pool settings the current pooled shells were started with */
+	private pooledSettings?: {size: number; terminalType: PlatformType};
 
 	constructor(private plugin: AITerminalPlugin) {
-		this.contextCollector = new ContextCollector(plugin.app);
-		this.placeholderResolver = new PlaceholderResolver(this.contextCollector);
-		this.terminalLauncher = new TerminalLauncher();
+		this.contextCollector = new ContextCollector(plugin.app, plugin.noteContextCache);
+		this.placeholderResolver = new PlaceholderResolver(this.contextCollector, plugin.templateCompiler);
+		this.terminalLauncher = new TerminalLauncher(new ShellSessionPool(() => ({
+			size: plugin.settings.sessionPoolSize,
+			idleTimeoutMs: plugin.settings.sessionPoolIdleTimeoutSeconds * 1000
+		})));
+		this.payloadOffloader = new PayloadOffloader(() => this.getPayloadDirectory());
 	}
 
 	/**
@@ -28,53 +59,254 @@ export class CommandExecutor {
 		context: Partial<ExecutionContext>
 	): Promise<boolean> {
 		try {
-			const agent = this.plugin.settings.agents.find(current => current.id === command.agentId);
-			if (!agent) {
-				new Notice(`Agent with ID '${command.agentId}' not found. Please update template.`);
+			await this.launchCommand(command, context);
+			new Notice(`Launched: ${command.name}`);
+			return true;
+		} catch (error) {
+			if (error instanceof CommandExecutionError) {
+				new Notice(error.message);
 				return false;
 			}
+			const message = error instanceof Error ? error.message : String(error);
+			new Notice(`Failed to execute command: ${message}`);
+			console.error("Command execution error:", error);
+			return false;
+		}
+	}
 
-			// Build full execution context
-			const fullContext: ExecutionContext = {
-				...context,
-				agent: context.agent ?? agent.name,
-				vault: this.plugin.app.vault
+	/**
+	 * Resolve and launch a command template without showing notices.
+	 * Throws CommandExecutionError for user-facing validation failures.
+	 */
+	async launchCommand(
+		command: CommandTemplate,
+		context: Partial<ExecutionContext>
+	): Promise<LaunchedCommand> {
+		const agent = this.plugin.settingsStore.getAgent(command.agentId);
+		if (!agent) {
+			throw new CommandExecutionError(`Agent with ID '${command.agentId}' not found. Please update template.`);
+		}
+
+		// Build full execution context
+		const fullContext: ExecutionContext = {
+			...context,
+			agent: context.agent ?? agent.name,
+			vault: this.plugin.app.vault
+		};
+
+		// Check if file context is required
+		if (this.placeholderResolver.requiresFileContext(command.template) && !fullContext.file) {
+			throw new CommandExecutionError("This command requires an active file. Please open a file and try again.");
+		}
+
+		const startedAt = Date.now();
+		const launchStart = performance.now();
+		const phases: LaunchRecord["phases"] = {};
+		let phaseStart = launchStart;
+		const endPhase = (phase: LaunchPhase) => {
+			const now = performance.now();
+			phases[phase] = now - phaseStart;
+			phaseStart = now;
+		};
+		let payloadChars = 0;
+		const recordLaunch = (success: boolean): LaunchRecord => {
+			const record: LaunchRecord = {
+				commandId: command.id,
+				commandName: command.name,
+				startedAt,
+				payloadChars,
+				totalMs: performance.now() - launchStart,
+				phases,
+				success
 			};
+			this.plugin.launchMetrics.record(record);
+			return record;
+		};
 
-			// Check if file context is required
-			if (this.placeholderResolver.requiresFileContext(command.template) && !fullContext.file) {
-				new Notice("This command requires an active file. Please open a file and try again.");
-				return false;
+		try {
+			const defaults = {
+				defaultPrompt: command.defaultPrompt,
+				agentCommand: agent.name
+			};
+			const referenced = this.getReferencedPlaceholders(command.template, fullContext, defaults);
+			if (fullContext.file) {
+				// Only placeholders the template actually uses are loaded
+				fullContext.noteContext = await this.contextCollector.collectNoteContext(
+					fullContext.file,
+					[...referenced.template, ...referenced.prompt]
+				);
 			}
+			endPhase("context");
+
+			await this.offloadPayloads(referenced, fullContext, defaults);
+			endPhase("offload");
 
 			const shell = resolveShellType(this.plugin.settings.terminalType);
 			const resolvedCommand = this.placeholderResolver.resolveForShell(
 				command.template,
 				fullContext,
-				{
-					defaultPrompt: command.defaultPrompt,
-					agentCommand: agent.name
-				},
+				defaults,
 				shell
 			);
+			payloadChars = resolvedCommand.length;
+			endPhase("resolve");
 
 			// Get working directory
 			const workingDir = this.placeholderResolver.getWorkingDirectory(fullContext);
 
 			// Launch terminal
-			await this.terminalLauncher.launch(
+			const timings = await this.terminalLauncher.launch(
 				this.plugin.settings.terminalType,
 				resolvedCommand,
 				workingDir
 			);
+			if (timings.encodeMs !== undefined) {
+				phases.encode = timings.encodeMs;
+			}
+			phases.spawn = timings.spawnMs;
 
-			new Notice(`Launched: ${command.name}`);
-			return true;
+			const record = recordLaunch(true);
+			void timings.ready?.then(readyMs => {
+				record.phases.ready = readyMs;
+			});
+			return {exited: timings.exited};
 		} catch (error) {
-			const message = error instanceof Error ? error.message : String(error);
-			new Notice(`Failed to execute command: ${message}`);
-			console.error("Command execution error:", error);
-			return false;
+			recordLaunch(false);
+			throw error;
 		}
 	}
+
+	/**
+	 * Pre-start pooled shells for the configured terminal at the vault root
+	 */
+	warmUp(): void {
+		const {sessionPoolSize, terminalType} = this.plugin.settings;
+		this.pooledSettings = {size: sessionPoolSize, terminalType};
+		if (sessionPoolSize > 0) {
+			this.terminalLauncher.warm(terminalType, this.contextCollector.getVaultPath());
+		}
+	}
+
+	/**
+	 * Replace pooled shells after the pool size or terminal type changed; a size of 0 kills them
+	 */
+	refreshSessionPool(): void {
+		const {sessionPoolSize, terminalType} = this.plugin.settings;
+		const pooled = this.pooledSettings;
+		if (pooled?.size === sessionPoolSize && pooled.terminalType === terminalType) {
+			return;
+		}
+		this.terminalLauncher.reset();
+		this.warmUp();
+	}
+
+	/**
+	 * Release pooled shells
+	 */
+	dispose(): void {
+		this.terminalLauncher.dispose();
+	}
+
+	/**
+	 * Placeholders referenced by the template and by the prompt it expands
+	 */
+	private getReferencedPlaceholders(
+		template: string,
+		context: ExecutionContext,
+		defaults: { defaultPrompt?: string }
+	): ReferencedPlaceholders {
+		const compiler = this.plugin.templateCompiler;
+		const compiled = compiler.compile(template);
+		const templatePlaceholders = compiled.placeholders;
+		const usesPrompt = templatePlaceholders.has("prompt") || templatePlaceholders.has("prompt-file");
+		return {
+			template: templatePlaceholders,
+			prompt: usesPrompt
+				? compiler.compilePrompt(context.prompt, defaults.defaultPrompt).placeholders
+				: new Set<string>(),
+			standalone: compiled.standalonePlaceholders
+		};
+	}
+
+	/**
+	 * Write selection/prompt payloads to temp files when the template references
+	 * them as files, or when they or rich note values exceed the offload threshold
+	 * and are whole arguments in the template. The batch file manifest is written when
+	 * <manifest-file> is referenced. Sets payloadFiles, and resolvedPrompt when
+	 * the prompt had to be rendered to measure or write it.
+	 */
+	private async offloadPayloads(
+		referenced: ReferencedPlaceholders,
+		context: ExecutionContext,
+		defaults: { defaultPrompt?: string }
+	): Promise<void> {
+		const threshold = this.plugin.settings.payloadOffloadThreshold;
+		const isOversized = (value: string) => threshold > 0 && value.length > threshold;
+		const {template: templatePlaceholders, prompt: promptPlaceholders, standalone} = referenced;
+		const payloadFiles: PayloadFiles = {};
+		context.payloadFiles = payloadFiles;
+
+		// A manifest template run from a single-file menu or the palette lists just that file
+		const batchFiles = context.batchFiles ?? (context.file ? [context.file] : []);
+		if (templatePlaceholders.has("manifest-file") || promptPlaceholders.has("manifest-file")) {
+			const manifest = batchFiles.map(file => this.contextCollector.getFilePath(file)).join("\n");
+			payloadFiles.manifest = await this.payloadOffloader.write("manifest", manifest);
+		}
+
+		const selection = context.selection ?? "";
+		if (
+			templatePlaceholders.has("selection-file")
+			|| promptPlaceholders.has("selection-file")
+			|| (standalone.has("selection") && isOversized(selection))
+		) {
+			payloadFiles.selection = await this.payloadOffloader.write("selection", selection);
+			if (standalone.has("selection")) {
+				this.warnIfTooLargeForArgument("selection", selection);
+			}
+		}
+
+		if (templatePlaceholders.has("prompt-file") || (standalone.has("prompt") && threshold > 0)) {
+			// Rendered once here and reused by resolveForShell
+			const prompt = this.placeholderResolver.resolvePrompt(context, defaults);
+			context.resolvedPrompt = prompt;
+			if (templatePlaceholders.has("prompt-file") || isOversized(prompt)) {
+				payloadFiles.prompt = await this.payloadOffloader.write("prompt", prompt);
+				if (standalone.has("prompt")) {
+					this.warnIfTooLargeForArgument("prompt", prompt);
+				}
+			}
+		}
+
+		for (const name of RICH_PLACEHOLDERS) {
+			const value = context.noteContext?.[name];
+			if (value !== undefined && standalone.has(name) && isOversized(value)) {
+				payloadFiles[name] = await this.payloadOffloader.write(name, value);
+				this.warnIfTooLargeForArgument(name, value);
+			}
+		}
+	}
+
+	/**
+	 * Warn before launch when an offloaded payload read back inline will still exceed
+	 * the OS argument limit, since the agent then fails inside the terminal
+	 */
+	private warnIfTooLargeForArgument(name: string, value: string): void {
+		if (!exceedsArgumentLimit(value)) {
+			return;
+		}
+		new Notice(
+			`AI Terminal: <${name}> (${value.length} characters) is too large to pass to the agent as one argument. ` +
+			"Use <selection-file> or <prompt-file> and let the agent read the file instead.",
+			10000
+		);
+	}
+
+	/**
+	 * Temp directory for offloaded payloads, inside the plugin's data dir
+	 */
+	private getPayloadDirectory(): string {
+		const manifest = this.plugin.manifest;
+		const pluginDir = manifest.dir ?? `${this.plugin.app.vault.configDir}/plugins/${manifest.id}`;
+		return `${this.contextCollector.getVaultPath()}/${pluginDir}/payloads`;
+	}
 }
@@ -24,9 +24,9 @@ export class CommandManager {
 	/**
 	 * Add a new command template
 	 */
-	async addCommand(command: CommandTemplate): Promise<void> {
+	addCommand(command: CommandTemplate): void {
 		// Validate unique ID
-		if (this.plugin.settings.commands.some(cmd => cmd.id === command.id)) {
+		if (this.plugin.settingsStore.getCommand(command.id)) {
 			throw new Error(`Command with ID '${command.id}' already exists`);
 		}
 
@@ -34,14 +34,14 @@ export class CommandManager {
 		this.validateTemplate(command.template, command.agentId);
 
 		this.plugin.settings.commands.push(command);
-		await this.plugin.saveSettings();
+		this.plugin.settingsStore.update({scope: "commands"});
 	}
 
 	/**
 	 * Update an existing command template
 	 */
-	async updateCommand(id: string, updates: Partial<CommandTemplate>): Promise<void> {
-		const index = this.plugin.settings.commands.findIndex(cmd => cmd.id === id);
+	updateCommand(id: string, updates: Partial<CommandTemplate>): void {
+		const index = this.plugin.settingsStore.getCommandIndex(id);
 		if (index === -1) {
 			throw new Error(`Command with ID '${id}' not found`);
 		}
@@ -67,69 +67,53 @@ export class CommandManager {
 		}
 
 		this.plugin.settings.commands[index] = updated;
-		await this.plugin.saveSettings();
+		this.plugin.settingsStore.update({scope: "commands"});
 	}
 
 	/**
 	 * Remove a command template
 	 */
-	async removeCommand(id: string): Promise<void> {
-		const index = this.plugin.settings.commands.findIndex(cmd => cmd.id === id);
+	removeCommand(id: string): void {
+		const index = this.plugin.settingsStore.getCommandIndex(id);
 		if (index === -1) {
 			throw new Error(`Command with ID '${id}' not found`);
 		}
 
 		this.plugin.settings.commands.splice(index, 1);
-		await this.plugin.saveSettings();
+		this.plugin.settingsStore.update({scope: "commands"});
 	}
 
 	/**
 	 * Move command up in the list
 	 */
-	async moveCommandUp(id: string): Promise<void> {
-		const commands = this.plugin.settings.commands;
-		const index = commands.findIndex(cmd => cmd.id === id);
+	moveCommandUp(id: string): void {
+		const index = this.plugin.settingsStore.getCommandIndex(id);
 		if (index <= 0) return; // Already at top or not found
 
-		const current = commands[index];
-		const previous = commands[index - 1];
-		if (!current || !previous) return;
-		
-		commands[index] = previous;
-		commands[index - 1] = current;
-		
-		await this.plugin.saveSettings();
+		this.plugin.settingsStore.swapCommands(index, index - 1);
 	}
 
 	/**
 	 * Move command down in the list
 	 */
-	async moveCommandDown(id: string): Promise<void> {
-		const commands = this.plugin.settings.commands;
-		const index = commands.findIndex(cmd => cmd.id === id);
-		if (index === -1 || index >= commands.length - 1) return;
-
-		const current = commands[index];
-		const next = commands[index + 1];
-		if (!current || !next) return;
-		
-		commands[index] = next;
-		commands[index + 1] = current;
-		
-		await this.plugin.saveSettings();
+	moveCommandDown(id: string): void {
+		const index = this.plugin.settingsStore.getCommandIndex(id);
+		if (index === -1 || index >= this.plugin.settings.commands.length - 1) return;
+
+		this.plugin.settingsStore.swapCommands(index, index + 1);
 	}
 
 	/**
 	 * Toggle command enabled state
 	 */
-	async toggleCommand(id: string): Promise<void> {
-		const command = this.plugin.settings.commands.find(cmd => cmd.id === id);
+	toggleCommand(id: string): void {
+		const command = this.plugin.settingsStore.getCommand(id);
 		if (!command) {
 			throw new Error(`Command with ID '${id}' not found`);
 		}
 
 		command.enabled = !command.enabled;
-		await this.plugin.saveSettings();
+		this.plugin.settingsStore.update({scope: "commands"});
 	}
 
 	/**
@@ -141,29 +125,18 @@ export class CommandManager {
 			throw new Error("Agent ID is required.");
 		}
 
-		const agentExists = this.plugin.settings.agents.some(agent => agent.id === agentId);
-		if (!agentExists) {
+		if (!this.plugin.settingsStore.getAgent(agentId)) {
 			throw new Error(`Agent with ID "${agentId}" not found.`);
 		}
 
-		// Extract placeholders from template
-		const placeholderRegex = /<([^>]+)>/g;
-		const matches = Array.from(template.matchAll(placeholderRegex));
-		
-		const validPlaceholders = new Set(AVAILABLE_PLACEHOLDERS.map(p => p.name));
-		const invalidPlaceholders: string[] = [];
-
-		for (const match of matches) {
-			const placeholder = match[1];
-			if (placeholder && !validPlaceholders.has(placeholder)) {
-				invalidPlaceholders.push(placeholder);
-			}
-		}
+		// Reuse the compiled template to find unknown placeholders
+		const validPlaceholders = AVAILABLE_PLACEHOLDERS.map(p => p.name);
+		const invalidPlaceholders = this.plugin.templateCompiler.compile(template).unknownPlaceholders;
 
 		if (invalidPlaceholders.length > 0) {
 			throw new Error(
 				`Invalid placeholders found: ${invalidPlaceholders.map(p => `<${p}>`).join(", ")}. ` +
-				`Valid placeholders: ${Array.from(validPlaceholders).map(p => `<${p}>`).join(", ")}`
+				`Valid placeholders: ${validPlaceholders.map(p => `<${p}>`).join(", ")}`
 			);
 		}
 
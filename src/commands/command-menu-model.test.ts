@@ -0,0 +1,24 @@
+import {describe, expect, it, vi} from "vitest";
+import {CommandMenuModel} from "./command-menu-model";
+import {createCommand} from "../__tests__/fixtures";
+
+describe("CommandMenuModel", () => {
+	it("builds entries once until invalidated", () => {
+		let commands = [createCommand("a"), createCommand("b", {template: "review <manifest-file>"})];
+		const getEnabledCommands = vi.fn(() => commands);
+		const model = new CommandMenuModel(getEnabledCommands, command => command.template.includes("<manifest-file>"));
+
+		const entries = model.getEntries();
+		expect(entries.map(entry => [entry.title, entry.usesManifest])).toEqual([
+			["AI Terminal: Command a", false],
+			["AI Terminal: Command b", true]
+		]);
+		expect(model.getEntries()).toBe(entries);
+		expect(getEnabledCommands).toHaveBeenCalledTimes(1);
+
+		commands = [createCommand("c")];
+		model.invalidate();
+		expect(model.getEntries().map(entry => entry.command.id)).toEqual(["c"]);
+		expect(getEnabledCommands).toHaveBeenCalledTimes(2);
+	});
+});
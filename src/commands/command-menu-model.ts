@@ -0,0 +1,44 @@
+import {CommandTemplate} from "../types";
+
+/**
+ * Precomputed context menu item for an enabled command template
+ */
+export interface CommandMenuEntry {
+	command: CommandTemplate;
+
+	/** Title shown in file and editor menus */
+	title: string;
+
+	/** Batch runs launch once with a manifest instead of once per file */
+	usesManifest: boolean;
+}
+
+/**
+ * Menu entries for enabled commands, built on first use after each settings change
+ */
+export class CommandMenuModel {
+	private entries: CommandMenuEntry[] | null = null;
+
+	constructor(
+		private getEnabledCommands: () => CommandTemplate[],
+		private usesManifest: (command: CommandTemplate) => boolean
+	) {}
+
+	getEntries(): CommandMenuEntry[] {
+		if (!this.entries) {
+			this.entries = this.getEnabledCommands().map(command => ({
+				command,
+				title: `AI Terminal: ${command.name}`,
+				usesManifest: this.usesManifest(command)
+			}));
+		}
+		return this.entries;
+	}
+
+	/**
+	 * Drop the entries so the next menu rebuilds them from settings
+	 */
+	invalidate(): void {
+		this.entries = null;
+	}
+}
@@ -0,0 +1,54 @@
+import {describe, expect, it, vi} from "vitest";
+import {PaletteCommand, PaletteCommandRegistry} from "./palette-command-registry";
+import {createCommand} from "../__tests__/fixtures";
+
+const createRegistry = () => {
+	const added: PaletteCommand[] = [];
+	const host = {
+		addCommand: vi.fn((command: PaletteCommand) => {
+			added.push(command);
+		}),
+		removeCommand: vi.fn()
+	};
+	const run = vi.fn();
+	return {registry: new PaletteCommandRegistry(host, run), host, added, run};
+};
+
+describe("PaletteCommandRegistry", () => {
+	it("registers every command on the first sync", () => {
+		const {registry, host, added} = createRegistry();
+		registry.sync([createCommand("a"), createCommand("b")]);
+
+		expect(host.addCommand).toHaveBeenCalledTimes(2);
+		expect(added.map(command => command.id)).toEqual(["ai-terminal-a", "ai-terminal-b"]);
+		expect(added[0]?.name).toBe("AI Terminal: Command a");
+	});
+
+	it("only touches added, removed and renamed commands", () => {
+		const {registry, host} = createRegistry();
+		registry.sync([createCommand("a"), createCommand("b"), createCommand("c")]);
+		host.addCommand.mockClear();
+
+		registry.sync([createCommand("a"), createCommand("c", {name: "Renamed"}), createCommand("d")]);
+
+		expect(host.removeCommand.mock.calls).toEqual([["ai-terminal-b"], ["ai-terminal-c"]]);
+		expect(host.addCommand.mock.calls.map(([command]) => command.id)).toEqual(["ai-terminal-c", "ai-terminal-d"]);
+	});
+
+	it("does nothing when commands are unchanged", () => {
+		const {registry, host} = createRegistry();
+		registry.sync([createCommand("a")]);
+		registry.sync([createCommand("a")]);
+
+		expect(host.addCommand).toHaveBeenCalledTimes(1);
+		expect(host.removeCommand).not.toHaveBeenCalled();
+	});
+
+	it("runs commands by template id", () => {
+		const {registry, added, run} = createRegistry();
+		registry.sync([createCommand("a")]);
+
+		added[0]?.callback();
+		expect(run).toHaveBeenCalledWith("a");
+	});
+});
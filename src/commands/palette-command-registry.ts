@@ -0,0 +1,63 @@
+import {CommandTemplate} from "../types";
+
+/**
+ * Palette command as registered with Obsidian
+ */
+export interface PaletteCommand {
+	id: string;
+	name: string;
+	callback: () => void;
+}
+
+/**
+ * Registration hooks provided by the plugin
+ */
+export interface PaletteCommandHost {
+	addCommand(command: PaletteCommand): void;
+	removeCommand(id: string): void;
+}
+
+/**
+ * Palette command id for a command template
+ */
+export const getPaletteCommandId = (templateId: string): string => `ai-terminal-${templateId}`;
+
+/**
+ * Keeps palette commands in sync with enabled command templates by diffing.
+ * Callbacks look the template up by id when run, so template edits need no re-registration.
+ */
+export class PaletteCommandRegistry {
+	/** Registered palette names by template id */
+	private registered = new Map<string, string>();
+
+	constructor(
+		private host: PaletteCommandHost,
+		private run: (templateId: string) => void
+	) {}
+
+	/**
+	 * Register added or renamed commands and remove disabled or deleted ones
+	 */
+	sync(commands: CommandTemplate[]): void {
+		const desired = new Map(commands.map(command => [command.id, `AI Terminal: ${command.name}`]));
+
+		this.registered.forEach((name, templateId) => {
+			if (desired.get(templateId) !== name) {
+				this.host.removeCommand(getPaletteCommandId(templateId));
+				this.registered.delete(templateId);
+			}
+		});
+
+		desired.forEach((name, templateId) => {
+			if (this.registered.has(templateId)) {
+				return;
+			}
+			this.host.addCommand({
+				id: getPaletteCommandId(templateId),
+				name,
+				callback: () => this.run(templateId)
+			});
+			this.registered.set(templateId, name);
+		});
+	}
+}
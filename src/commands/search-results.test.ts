@@ -0,0 +1,26 @@
+import {describe, expect, it} from "vitest";
+import {TFile, TFolder} from "obsidian";
+import {getSearchResultFiles} from "./search-results";
+
+const createFile = (path: string): TFile => {
+	const file = new TFile();
+	file.path = path;
+	return file;
+};
+
+describe("getSearchResultFiles", () => {
+	it("returns the files and folders listed in the results view", () => {
+		const note = createFile("notes/a.md");
+		const folder = new TFolder();
+		const leaf = {dom: {vChildren: {children: [{file: note}, {file: folder}, {file: "notes/b.md"}, {}, null]}}};
+
+		expect(getSearchResultFiles(leaf)).toEqual([note, folder]);
+	});
+
+	it("returns nothing when the view internals are missing or changed", () => {
+		expect(getSearchResultFiles(undefined)).toEqual([]);
+		expect(getSearchResultFiles(null)).toEqual([]);
+		expect(getSearchResultFiles({})).toEqual([]);
+		expect(getSearchResultFiles({dom: {vChildren: {children: "not a list"}}})).toEqual([]);
+	});
+});
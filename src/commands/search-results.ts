@@ -0,0 +1,33 @@
+import {EventRef, TAbstractFile} from "obsidian";
+
+/**
+ * Workspace event fired when the search results menu opens.
+ * Not part of the public API typings, so callers cast the workspace to this shape.
+ */
+export interface SearchResultsMenuEvents {
+	on(name: "search:results-menu", callback: (menu: unknown, leaf: unknown) => void): EventRef;
+}
+
+/**
+ * Internal shape of a search results view; every level may be missing in other Obsidian versions
+ */
+interface SearchResultsLeaf {
+	dom?: {
+		vChildren?: {
+			children?: {file?: unknown}[];
+		};
+	};
+}
+
+/**
+ * Read the files listed in a search results view, if its internals are available
+ */
+export const getSearchResultFiles = (leaf: unknown): TAbstractFile[] => {
+	const children = (leaf as SearchResultsLeaf | null | undefined)?.dom?.vChildren?.children;
+	if (!Array.isArray(children)) {
+		return [];
+	}
+	return children
+		.map(child => child?.file)
+		.filter((file): file is TAbstractFile => file instanceof TAbstractFile);
+};
@@ -1,6 +1,40 @@
-import {describe, expect, it, vi} from "vitest";
-import {App} from "obsidian";
+import {afterEach, describe, expect, it, vi} from "vitest";
+import {App, Menu, TFile, TFolder} from "obsidian";
 import AITerminalPlugin from "./main";
+import {BatchRunner} from "./commands/batch-runner";
+import {TerminalLauncher} from "./terminal/terminal-launcher";
+import {createDefaultSettings} from "./settings";
+
+/**
+ * Plugin with a workspace that records event handlers and the layout-ready callback
+ */
+const createPlugin = () => {
+	const app = new App() as any;
+	app.vault.adapter = {getBasePath: () => "/vault"};
+	const handlers: Record<string, (...args: any[]) => void> = {};
+	let layoutReady: () => void = () => {};
+	app.workspace = {
+		on: vi.fn((name: string, callback: (...args: any[]) => void) => {
+			handlers[name] = callback;
+			return {};
+		}),
+		onLayoutReady: vi.fn((callback: () => void) => {
+			layoutReady = callback;
+		}),
+		getActiveFile: () => null
+	};
+	const plugin = new AITerminalPlugin(app, {id: "ai-terminal"} as any);
+	const loadSpy = vi.spyOn(plugin, "loadData").mockResolvedValue(createDefaultSettings());
+	vi.spyOn(plugin, "saveData").mockResolvedValue(undefined);
+	return {plugin, handlers, loadSpy, runLayoutReady: () => layoutReady()};
+};
+
+/**
+ * Items recorded by the mocked Menu; the real Obsidian typings do not expose them
+ */
+const getItems = (menu: Menu): {title?: string; trigger(): void}[] => (menu as any).items;
+
+const getTitle = (menu: Menu, index: number): string => getItems(menu)[index]?.title ?? "";
 
 describe("AITerminalPlugin settings load", () => {
 	it("shows a notice when settings are reset", async () => {
@@ -34,3 +68,140 @@ describe("AITerminalPlugin settings load", () => {
 		saveSpy.mockRestore();
 	});
 });
+
+describe("AITerminalPlugin context menus", () => {
+	afterEach(() => {
+		vi.restoreAllMocks();
+	});
+
+	it("expands a folder into markdown files only when a batch item is clicked", async () => {
+		const {plugin, handlers} = createPlugin();
+		await plugin.onload();
+		await plugin.whenReady();
+		const run = vi.spyOn(BatchRunner.prototype, "run").mockResolvedValue(undefined);
+
+		const note = new TFile();
+		note.path = "notes/a.md";
+		const folder = new TFolder();
+		const getChildren = vi.fn(() => [note]);
+		Object.defineProperty(folder, "children", {get: getChildren});
+
+		const menu = new Menu();
+		handlers["file-menu"]?.(menu, folder);
+
+		expect(getItems(menu).length).toBeGreaterThan(0);
+		expect(getTitle(menu, 0)).toMatch(/\(batch\)$/);
+		expect(getChildren).not.toHaveBeenCalled();
+
+		getItems(menu)[0]?.trigger();
+		expect(getChildren).toHaveBeenCalled();
+		expect(run).toHaveBeenCalledWith(plugin.settings.commands[0], [note]);
+	});
+});
+
+describe("AITerminalPlugin session pool", () => {
+	afterEach(() => {
+		vi.restoreAllMocks();
+	});
+
+	it("restarts pooled shells only when the pool size or terminal type changes", async () => {
+		const {plugin, runLayoutReady} = createPlugin();
+		const reset = vi.spyOn(TerminalLauncher.prototype, "reset").mockImplementation(() => {});
+		const warm = vi.spyOn(TerminalLauncher.prototype, "warm").mockImplementation(() => {});
+		await plugin.onload();
+		runLayoutReady();
+		await plugin.whenReady();
+		await new Promise(resolve => setTimeout(resolve, 0));
+
+		plugin.settings.sessionPoolSize = 2;
+		plugin.saveSettings();
+		expect(reset).toHaveBeenCalledTimes(1);
+		expect(warm).toHaveBeenCalledTimes(1);
+		expect(warm).toHaveBeenCalledWith(plugin.settings.terminalType, expect.any(String));
+
+		plugin.settings.debugLogging = true;
+		plugin.saveSettings();
+		expect(reset).toHaveBeenCalledTimes(1);
+
+		plugin.settings.sessionPoolSize = 0;
+		plugin.saveSettings();
+		expect(reset).toHaveBeenCalledTimes(2);
+		expect(warm).toHaveBeenCalledTimes(1);
+
+		plugin.onunload();
+	});
+});
+
+describe("AITerminalPlugin lazy startup", () => {
+	afterEach(() => {
+		vi.restoreAllMocks();
+	});
+
+	const getCommandIds = (plugin: AITerminalPlugin): string[] =>
+		(plugin as any).commands.map((command: {id: string}) => command.id);
+
+	it("loads settings once when the layout is ready", async () => {
+		const {plugin, loadSpy, runLayoutReady} = createPlugin();
+		await plugin.onload();
+		expect(loadSpy).not.toHaveBeenCalled();
+		expect(plugin.isReady()).toBe(false);
+
+		runLayoutReady();
+		await Promise.all([plugin.whenReady(), plugin.whenReady()]);
+
+		expect(loadSpy).toHaveBeenCalledTimes(1);
+		expect(plugin.isReady()).toBe(true);
+	});
+
+	it("listens for vault changes only once the layout is ready", async () => {
+		const {plugin, runLayoutReady} = createPlugin();
+		const vaultOn = vi.spyOn(plugin.app.vault, "on");
+		await plugin.onload();
+		expect(vaultOn).not.toHaveBeenCalled();
+
+		runLayoutReady();
+		expect(vaultOn).toHaveBeenCalledWith("create", expect.any(Function));
+	});
+
+	it("retries loading after a failed attempt", async () => {
+		const {plugin, loadSpy} = createPlugin();
+		loadSpy.mockRejectedValueOnce(new Error("read failed"));
+		await plugin.onload();
+
+		await expect(plugin.whenReady()).rejects.toThrow("read failed");
+		expect(plugin.isReady()).toBe(false);
+
+		await plugin.whenReady();
+		expect(loadSpy).toHaveBeenCalledTimes(2);
+		expect(plugin.isReady()).toBe(true);
+	});
+
+	it("starts loading from a menu opened before settings are ready", async () => {
+		const {plugin, handlers, loadSpy} = createPlugin();
+		await plugin.onload();
+
+		const earlyMenu = new Menu();
+		handlers["editor-menu"]?.(earlyMenu, {getSelection: () => ""}, {file: null});
+		expect(getItems(earlyMenu)).toHaveLength(0);
+		expect(loadSpy).toHaveBeenCalledTimes(1);
+
+		await plugin.whenReady();
+		const menu = new Menu();
+		handlers["editor-menu"]?.(menu, {getSelection: () => ""}, {file: null});
+		expect(getTitle(menu, 0)).toBe("Direct prompt...");
+		expect(loadSpy).toHaveBeenCalledTimes(1);
+	});
+
+	it("registers template palette commands only after initialization", async () => {
+		const {plugin} = createPlugin();
+		await plugin.onload();
+		expect(getCommandIds(plugin)).toEqual(["direct-prompt", "cancel-batch"]);
+
+		await plugin.whenReady();
+		const templateIds = plugin.settings.commands
+			.filter(command => command.enabled)
+			.map(command => `ai-terminal-${command.id}`);
+		expect(templateIds.length).toBeGreaterThan(0);
+		expect(getCommandIds(plugin)).toEqual(["direct-prompt", "cancel-batch", ...templateIds]);
+	});
+});
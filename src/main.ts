@@ -1,40 +1,151 @@
-import {Plugin, TFile, Menu, Editor, MarkdownView, Notice} from 'obsidian';
+import {Plugin, TFile, TFolder, TAbstractFile, Menu, Editor, MarkdownView, Notice} from 'obsidian';
 import {AITerminalSettingTab, loadSettings} from "./settings";
-import {AITerminalSettings} from "./types";
+import {AITerminalSettings, StartupTimings} from "./types";
 import {CommandManager} from "./commands/command-manager";
 import {CommandExecutor} from "./commands/command-executor";
+import {BatchRunner, collectMarkdownFiles} from "./commands/batch-runner";
 import {DirectPromptModal} from "./ui/direct-prompt-modal";
+import {TemplateCompiler} from "./placeholders/template-compiler";
+import {NoteContextCache} from "./placeholders/note-context-cache";
+import {LaunchMetrics} from "./metrics/launch-metrics";
+import {debugLog, setDebugLogging} from "./utils/debug-log";
+import {SettingsChange, SettingsStore} from "./settings-store";
+import {CommandMenuModel} from "./commands/command-menu-model";
+import {PaletteCommandRegistry} from "./commands/palette-command-registry";
+import {getSearchResultFiles, SearchResultsMenuEvents} from "./commands/search-results";
 
 export default class AITerminalPlugin extends Plugin {
 	settings: AITerminalSettings;
-	private commandManager: CommandManager;
-	private commandExecutor: CommandExecutor;
+	readonly templateCompiler = new TemplateCompiler();
+	readonly noteContextCache = new NoteContextCache();
+	readonly launchMetrics = new LaunchMetrics();
+	readonly settingsStore = new SettingsStore(() => this.settings, settings => this.saveData(settings));
+	readonly startupTimings: StartupTimings = {onloadMs: 0};
+	// Created on first use, after settings are loaded
+	private commandManager?: CommandManager;
+	private commandExecutor?: CommandExecutor;
+	private batchRunner?: BatchRunner;
+	private initialization: Promise<void> | null = null;
+	private ready = false;
+	private readonly menuModel = new CommandMenuModel(
+		() => this.getCommandManager().getEnabledCommands(),
+		command => this.getBatchRunner().usesManifest(command)
+	);
+	private readonly paletteRegistry = new PaletteCommandRegistry(
+		{
+			addCommand: command => this.addCommand(command),
+			removeCommand: id => this.removePaletteCommand(id)
+		},
+		templateId => this.runPaletteCommand(templateId)
+	);
 
 	async onload() {
-		await this.loadSettings();
+		const start = performance.now();
+
+		// Only lightweight stubs are registered here; settings, the migration pass and
+		// command templates are loaded once the layout is ready or on first use
 
-		// Initialize managers
-		this.commandManager = new CommandManager(this);
-		this.commandExecutor = new CommandExecutor(this);
+		// Apply settings changes as they happen; writes are coalesced by the store
+		this.register(this.settingsStore.onChange(change => this.onSettingsChanged(change)));
 
 		// Register settings tab
 		this.addSettingTab(new AITerminalSettingTab(this.app, this));
 
-		// Register commands in command palette
+		// Register built-in commands in command palette
 		this.registerCommands();
 
 		// Register context menu handlers
 		this.registerContextMenus();
+
+		this.app.workspace.onLayoutReady(() => {
+			// Registered after the vault has loaded, which fires "create" for every existing file
+			this.registerCacheInvalidation();
+			this.startInitialization();
+			// Pre-start pooled shells once settings are loaded
+			void this.whenReady().then(() => this.getCommandExecutor().warmUp(), () => {});
+		});
+
+		this.startupTimings.onloadMs = performance.now() - start;
 	}
 
 	onunload() {
-		// Cleanup handled automatically by Obsidian
+		// Stop launching the rest of a running batch
+		this.batchRunner?.cancel();
+		// Kill idle pooled shells
+		this.commandExecutor?.dispose();
+		// Write any settings change still waiting for the debounce
+		void this.settingsStore.flush();
+	}
+
+	/**
+	 * Load settings and register template commands, once
+	 */
+	whenReady(): Promise<void> {
+		if (!this.initialization) {
+			this.initialization = this.initialize().catch(error => {
+				// Allow a later call to retry
+				this.initialization = null;
+				throw error;
+			});
+		}
+		return this.initialization;
+	}
+
+	/**
+	 * Check if settings are loaded
+	 */
+	isReady(): boolean {
+		return this.ready;
+	}
+
+	/**
+	 * Shared executor, created on first use
+	 */
+	getCommandExecutor(): CommandExecutor {
+		if (!this.commandExecutor) {
+			this.commandExecutor = new CommandExecutor(this);
+		}
+		return this.commandExecutor;
+	}
+
+	private getCommandManager(): CommandManager {
+		if (!this.commandManager) {
+			this.commandManager = new CommandManager(this);
+		}
+		return this.commandManager;
+	}
+
+	private getBatchRunner(): BatchRunner {
+		if (!this.batchRunner) {
+			this.batchRunner = new BatchRunner(this, this.getCommandExecutor());
+		}
+		return this.batchRunner;
+	}
+
+	private async initialize(): Promise<void> {
+		const start = performance.now();
+		await this.loadSettings();
+		this.ready = true;
+		this.paletteRegistry.sync(this.getCommandManager().getEnabledCommands());
+		this.startupTimings.initializeMs = performance.now() - start;
+		debugLog(`Loaded in ${this.startupTimings.onloadMs.toFixed(1)} ms, initialized in ${this.startupTimings.initializeMs.toFixed(1)} ms`);
+	}
+
+	/**
+	 * Start loading settings without waiting, logging failures
+	 */
+	private startInitialization(): void {
+		this.whenReady().catch(error => {
+			console.error("[AI Terminal] Failed to load settings:", error);
+			new Notice("AI Terminal: Failed to load settings. See the developer console for details.");
+		});
 	}
 
 	async loadSettings() {
 		const rawSettings = await this.loadData() as Partial<AITerminalSettings> | null;
 		const {settings, wasReset, didUpdate} = loadSettings(rawSettings ?? {});
 		this.settings = settings;
+		setDebugLogging(this.settings.debugLogging);
 		if (!rawSettings || wasReset || didUpdate || rawSettings.settingsVersion !== settings.settingsVersion) {
 			await this.saveData(this.settings);
 		}
@@ -46,39 +157,51 @@ export default class AITerminalPlugin extends Plugin {
 		}
 	}
 
-	async saveSettings() {
-		await this.saveData(this.settings);
+	/**
+	 * Mark all settings as changed; the write is debounced and coalesced
+	 */
+	saveSettings(): void {
+		this.settingsStore.update();
+	}
+
+	private onSettingsChanged(change: SettingsChange): void {
+		if (change.scope === "all") {
+			setDebugLogging(this.settings.debugLogging);
+			this.commandExecutor?.refreshSessionPool();
+		}
 		// Re-register commands when settings change
 		this.reregisterCommands();
 	}
 
 	/**
-	 * Register all enabled commands in command palette
+	 * Register built-in palette commands; template commands are added once settings load
 	 */
 	private registerCommands(): void {
-		const enabledCommands = this.commandManager.getEnabledCommands();
-
 		this.addCommand({
 			id: "direct-prompt",
 			name: "Direct prompt",
 			callback: () => {
 				const activeFile = this.app.workspace.getActiveFile();
-				this.openDirectPromptModal(activeFile ?? undefined, undefined);
+				this.startInitialization();
+				void this.whenReady().then(() => {
+					this.openDirectPromptModal(activeFile ?? undefined, undefined);
+				}, () => {});
 			}
 		});
 
-		enabledCommands.forEach(cmd => {
-			this.addCommand({
-				id: `ai-terminal-${cmd.id}`,
-				name: `AI Terminal: ${cmd.name}`,
-				callback: () => {
-					const activeFile = this.app.workspace.getActiveFile();
-					void this.commandExecutor.executeCommand(cmd, {
-						file: activeFile ?? undefined,
-						vault: this.app.vault
-					});
+		this.addCommand({
+			id: "cancel-batch",
+			name: "Cancel running batch",
+			checkCallback: (checking: boolean) => {
+				const batchRunner = this.batchRunner;
+				if (!batchRunner?.isRunning()) {
+					return false;
 				}
-			});
+				if (!checking) {
+					batchRunner.cancel();
+				}
+				return true;
+			}
 		});
 	}
 
@@ -86,36 +209,120 @@ export default class AITerminalPlugin extends Plugin {
 	 * Re-register commands (called when settings change)
 	 */
 	private reregisterCommands(): void {
-		// Obsidian doesn't provide a way to unregister commands,
-		// so we rely on plugin reload for now
-		// TODO: Find a better way to handle dynamic command registration
+		this.menuModel.invalidate();
+		// Only added, removed or renamed palette commands are touched
+		this.paletteRegistry.sync(this.getCommandManager().getEnabledCommands());
+	}
+
+	private runPaletteCommand(templateId: string): void {
+		const command = this.settingsStore.getCommand(templateId);
+		if (!command) {
+			return;
+		}
+		const activeFile = this.app.workspace.getActiveFile();
+		void this.getCommandExecutor().executeCommand(command, {
+			file: activeFile ?? undefined,
+			vault: this.app.vault
+		});
+	}
+
+	/**
+	 * Unregister a palette command added by this plugin
+	 */
+	private removePaletteCommand(id: string): void {
+		// Plugin.removeCommand only exists on Obsidian 1.7.2+
+		const plugin = this as unknown as {removeCommand?: (id: string) => void};
+		if (typeof plugin.removeCommand === "function") {
+			plugin.removeCommand(id);
+			return;
+		}
+		const commands = (this.app as unknown as {commands?: {removeCommand?: (id: string) => void}}).commands;
+		commands?.removeCommand?.(`${this.manifest.id}:${id}`);
+	}
+
+	/**
+	 * Invalidate cached note context on vault and metadata changes
+	 */
+	private registerCacheInvalidation(): void {
+		const invalidate = (file: TAbstractFile) => this.noteContextCache.invalidate(file.path);
+		this.registerEvent(this.app.vault.on("create", invalidate));
+		this.registerEvent(this.app.vault.on("modify", invalidate));
+		this.registerEvent(this.app.vault.on("delete", invalidate));
+		this.registerEvent(this.app.vault.on("rename", (file: TAbstractFile, oldPath: string) => {
+			this.noteContextCache.invalidate(oldPath);
+			invalidate(file);
+		}));
+		this.registerEvent(this.app.metadataCache.on("changed", invalidate));
 	}
 
 	/**
 	 * Register context menu handlers
 	 */
 	private registerContextMenus(): void {
-		// File context menu (right-click on file in file explorer)
+		// File context menu (right-click on file or folder in file explorer)
+		this.registerEvent(
+			this.app.workspace.on("file-menu", (menu: Menu, file: TAbstractFile) => {
+				if (!this.canPopulateMenus()) {
+					return;
+				}
+				if (file instanceof TFolder) {
+					this.addBatchCommandsToMenu(menu, [file]);
+					return;
+				}
+				if (file instanceof TFile) {
+					this.addCommandsToMenu(menu, file, undefined);
+				}
+			})
+		);
+
+		// Multi-selection context menu in file explorer
+		this.registerEvent(
+			this.app.workspace.on("files-menu", (menu: Menu, files: TAbstractFile[]) => {
+				if (!this.canPopulateMenus()) {
+					return;
+				}
+				this.addBatchCommandsToMenu(menu, files);
+			})
+		);
+
+		// Search results context menu. The event is not in the public typings, so the workspace is
+		// cast to the one overload used here and both arguments are checked before use.
+		const searchEvents = this.app.workspace as unknown as SearchResultsMenuEvents;
 		this.registerEvent(
-			this.app.workspace.on("file-menu", (menu: Menu, file: TFile) => {
-				this.addCommandsToMenu(menu, file, undefined);
+			searchEvents.on("search:results-menu", (menu: unknown, leaf: unknown) => {
+				if (menu instanceof Menu && this.canPopulateMenus()) {
+					this.addBatchCommandsToMenu(menu, getSearchResultFiles(leaf));
+				}
 			})
 		);
 
 		// Editor context menu (right-click in editor)
 		this.registerEvent(
 			this.app.workspace.on("editor-menu", (menu: Menu, editor: Editor, view: MarkdownView) => {
-				const selection = editor.getSelection();
-				this.addCommandsToMenu(menu, view.file, selection);
+				if (!this.canPopulateMenus()) {
+					return;
+				}
+				// Read the selection only when an item is clicked
+				this.addCommandsToMenu(menu, view.file, () => editor.getSelection());
 			})
 		);
 	}
 
+	/**
+	 * Menus are only filled once settings are loaded; a menu opened earlier starts the load instead
+	 */
+	private canPopulateMenus(): boolean {
+		if (!this.ready) {
+			this.startInitialization();
+		}
+		return this.ready;
+	}
+
 	/**
 	 * Add command templates to a context menu
 	 */
-	private addCommandsToMenu(menu: Menu, file: TFile | null, selection?: string): void {
-		const enabledCommands = this.commandManager.getEnabledCommands();
+	private addCommandsToMenu(menu: Menu, file: TFile | null, getSelection?: () => string): void {
+		const entries = this.menuModel.getEntries();
 
 		// Add separator before our commands
 		menu.addSeparator();
@@ -126,27 +333,27 @@ export default class AITerminalPlugin extends Plugin {
 				.setIcon("edit")
 				.onClick(() => {
 					menu.hide();
-					this.openDirectPromptModal(file ?? undefined, selection);
+					this.openDirectPromptModal(file ?? undefined, getSelection?.());
 				});
 		});
 
-		if (enabledCommands.length === 0) {
+		if (entries.length === 0) {
 			return;
 		}
 
 		// Separator between direct prompt and templates
 		menu.addSeparator();
 
-		enabledCommands.forEach(cmd => {
+		entries.forEach(({command, title}) => {
 			menu.addItem(item => {
 				item
-					.setTitle(`AI Terminal: ${cmd.name}`)
+					.setTitle(title)
 					.setIcon("terminal")
 					.onClick(() => {
 						menu.hide();
-						void this.commandExecutor.executeCommand(cmd, {
+						void this.getCommandExecutor().executeCommand(command, {
 							file: file ?? undefined,
-							selection: selection || undefined,
+							selection: getSelection?.() || undefined,
 							vault: this.app.vault
 						});
 					});
@@ -154,6 +361,32 @@ export default class AITerminalPlugin extends Plugin {
 		});
 	}
 
+	/**
+	 * Add batch variants of command templates to a folder/multi-file/search menu.
+	 * Folders are expanded into markdown files only when an item is clicked.
+	 */
+	private addBatchCommandsToMenu(menu: Menu, items: TAbstractFile[]): void {
+		const entries = this.menuModel.getEntries();
+		if (items.length === 0 || entries.length === 0) {
+			return;
+		}
+
+		menu.addSeparator();
+
+		entries.forEach(({command, title, usesManifest}) => {
+			const suffix = usesManifest ? "(batch, single run)" : "(batch)";
+			menu.addItem(item => {
+				item
+					.setTitle(`${title} ${suffix}`)
+					.setIcon("terminal")
+					.onClick(() => {
+						menu.hide();
+						void this.getBatchRunner().run(command, collectMarkdownFiles(items));
+					});
+			});
+		});
+	}
+
 	private openDirectPromptModal(file?: TFile, selection?: string): void {
 		const modal = new DirectPromptModal(this.app, this, file, selection);
 		modal.open();
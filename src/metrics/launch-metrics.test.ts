@@ -0,0 +1,67 @@
+import {describe, expect, it} from "vitest";
+import {LaunchMetrics, LaunchRecord, percentile} from "./launch-metrics";
+
+const createRecord = (overrides: Partial<LaunchRecord> = {}): LaunchRecord => ({
+	commandId: "cmd-1",
+	commandName: "Open",
+	startedAt: 0,
+	payloadChars: 100,
+	totalMs: 10,
+	phases: {resolve: 1, spawn: 5},
+	success: true,
+	...overrides
+});
+
+describe("percentile", () => {
+	it("uses the nearest rank", () => {
+		const values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10];
+		expect(percentile(values, 50)).toBe(5);
+		expect(percentile(values, 95)).toBe(10);
+		expect(percentile([7], 95)).toBe(7);
+		expect(percentile([], 50)).toBe(0);
+	});
+});
+
+describe("LaunchMetrics", () => {
+	it("overwrites the oldest records when full", () => {
+		const metrics = new LaunchMetrics(3);
+		for (let i = 1; i <= 5; i++) {
+			metrics.record(createRecord({startedAt: i}));
+		}
+
+		expect(metrics.getRecords().map(record => record.startedAt)).toEqual([3, 4, 5]);
+	});
+
+	it("summarizes successful launches per command", () => {
+		const metrics = new LaunchMetrics();
+		[10, 20, 30, 40].forEach(totalMs => metrics.record(createRecord({totalMs, payloadChars: totalMs * 10})));
+		metrics.record(createRecord({totalMs: 999, success: false}));
+		metrics.record(createRecord({commandId: "cmd-2", commandName: "Review", totalMs: 5}));
+
+		const [open, review] = metrics.summarize();
+		expect(open).toEqual({
+			commandId: "cmd-1",
+			commandName: "Open",
+			count: 4,
+			p50Ms: 20,
+			p95Ms: 40,
+			avgPayloadChars: 250,
+			maxPayloadChars: 400
+		});
+		expect(review?.count).toBe(1);
+		expect(review?.p95Ms).toBe(5);
+	});
+
+	it("exports summaries and records as JSON and clears them", () => {
+		const metrics = new LaunchMetrics();
+		metrics.record(createRecord());
+
+		const exported = JSON.parse(metrics.toJSON()) as {summaries: unknown[]; records: LaunchRecord[]};
+		expect(exported.summaries).toHaveLength(1);
+		expect(exported.records[0]?.phases).toEqual({resolve: 1, spawn: 5});
+
+		metrics.clear();
+		expect(metrics.getRecords()).toEqual([]);
+		expect(metrics.summarize()).toEqual([]);
+	});
+});
@@ -0,0 +1,135 @@
+/**
+ * Measured phases of a command launch
+ */
+export type LaunchPhase = "context" | "offload" | "resolve" | "encode" | "spawn" | "ready";
+
+/**
+ * Timings of one command launch
+ */
+export interface LaunchRecord {
+	commandId: string;
+	commandName: string;
+
+	/** Epoch milliseconds when the launch started */
+	startedAt: number;
+
+	/** Length of the resolved command, in characters */
+	payloadChars: number;
+
+	/** Time from start until the terminal was spawned, in milliseconds */
+	totalMs: number;
+
+	/** Per-phase durations in milliseconds; ready is measured from the spawn call */
+	phases: Partial<Record<LaunchPhase, number>>;
+
+	success: boolean;
+}
+
+/**
+ * Latency percentiles for one command template
+ */
+export interface CommandLatencySummary {
+	commandId: string;
+	commandName: string;
+	count: number;
+	p50Ms: number;
+	p95Ms: number;
+	avgPayloadChars: number;
+	maxPayloadChars: number;
+}
+
+const DEFAULT_CAPACITY = 200;
+
+/**
+ * Nearest-rank percentile of ascending values
+ */
+export const percentile = (sorted: number[], p: number): number => {
+	if (sorted.length === 0) {
+		return 0;
+	}
+	const rank = Math.ceil((p / 100) * sorted.length);
+	return sorted[Math.min(sorted.length, Math.max(rank, 1)) - 1] ?? 0;
+};
+
+/**
+ * Fixed-size ring buffer of recent launch timings
+ */
+export class LaunchMetrics {
+	private records: (LaunchRecord | undefined)[];
+	private next = 0;
+	private count = 0;
+
+	constructor(private capacity: number = DEFAULT_CAPACITY) {
+		this.records = new Array(capacity);
+	}
+
+	/**
+	 * Store a launch, overwriting the oldest one when full
+	 */
+	record(record: LaunchRecord): void {
+		this.records[this.next] = record;
+		this.next = (this.next + 1) % this.capacity;
+		this.count = Math.min(this.count + 1, this.capacity);
+	}
+
+	/**
+	 * Stored launches, oldest first
+	 */
+	getRecords(): LaunchRecord[] {
+		const start = (this.next - this.count + this.capacity) % this.capacity;
+		const records: LaunchRecord[] = [];
+		for (let i = 0; i < this.count; i++) {
+			const record = this.records[(start + i) % this.capacity];
+			if (record) {
+				records.push(record);
+			}
+		}
+		return records;
+	}
+
+	/**
+	 * Per-command p50/p95 of total launch time over successful launches
+	 */
+	summarize(): CommandLatencySummary[] {
+		const byCommand = new Map<string, LaunchRecord[]>();
+		this.getRecords()
+			.filter(record => record.success)
+			.forEach(record => {
+				const records = byCommand.get(record.commandId) ?? [];
+				records.push(record);
+				byCommand.set(record.commandId, records);
+			});
+
+		return Array.from(byCommand.values()).map(records => {
+			const totals = records.map(record => record.totalMs).sort((a, b) => a - b);
+			const payloads = records.map(record => record.payloadChars);
+			const latest = records[records.length - 1] as LaunchRecord;
+			return {
+				commandId: latest.commandId,
+				commandName: latest.commandName,
+				count: records.length,
+				p50Ms: percentile(totals, 50),
+				p95Ms: percentile(totals, 95),
+				avgPayloadChars: Math.round(payloads.reduce((sum, value) => sum + value, 0) / payloads.length),
+				maxPayloadChars: Math.max(...payloads)
+			};
+		});
+	}
+
+	/**
+	 * Export summaries and raw records as JSON
+	 */
+	toJSON(): string {
+		return JSON.stringify({
+			exportedAt: new Date().toISOString(),
+			summaries: this.summarize(),
+			records: this.getRecords()
+		}, null, 2);
+	}
+
+	clear(): void {
+		this.records = new Array(this.capacity);
+		this.next = 0;
+		this.count = 0;
+	}
+}
@@ -0,0 +1,89 @@
+import {beforeEach, describe, expect, it, vi} from "vitest";
+import {App, TFile} from "obsidian";
+import {ContextCollector} from "./context-collector";
+import {NoteContextCache} from "./note-context-cache";
+
+describe("ContextCollector", () => {
+	let app: any;
+	let cache: NoteContextCache;
+	let collector: ContextCollector;
+	let file: TFile;
+
+	beforeEach(() => {
+		app = new App();
+		app.vault.adapter = {getBasePath: vi.fn(() => "/vault")};
+		app.vault.cachedRead = vi.fn(async () => "# Note\nBody");
+		app.metadataCache.getFileCache = vi.fn(() => ({
+			frontmatter: {title: "Note", tags: ["docs"]},
+			tags: [{tag: "#todo"}, {tag: "#todo"}]
+		}));
+		app.metadataCache.resolvedLinks = {
+			"notes/note.md": {"notes/setup.md": 1},
+			"index.md": {"notes/note.md": 2},
+			"other.md": {"notes/setup.md": 1}
+		};
+
+		cache = new NoteContextCache();
+		collector = new ContextCollector(app, cache);
+		file = new TFile();
+		file.name = "note.md";
+		file.path = "notes/note.md";
+		file.stat.mtime = 1;
+	});
+
+	it("loads only the requested rich placeholders", async () => {
+		const noteContext = await collector.collectNoteContext(file, ["content", "file", "prompt"]);
+
+		expect(noteContext).toEqual({content: "# Note\nBody"});
+		expect(app.metadataCache.getFileCache).not.toHaveBeenCalled();
+	});
+
+	it("resolves frontmatter, tags, links and backlinks from the metadata cache", async () => {
+		const noteContext = await collector.collectNoteContext(file, ["frontmatter", "tags", "links", "backlinks"]);
+
+		expect(noteContext).toEqual({
+			frontmatter: "{\"title\":\"Note\",\"tags\":[\"docs\"]}",
+			tags: "#todo #docs",
+			links: "notes/setup.md",
+			backlinks: "index.md"
+		});
+	});
+
+	it("reuses cached content until the note mtime changes", async () => {
+		await collector.collectNoteContext(file, ["content"]);
+		await collector.collectNoteContext(file, ["content"]);
+		expect(app.vault.cachedRead).toHaveBeenCalledTimes(1);
+
+		file.stat.mtime = 2;
+		await collector.collectNoteContext(file, ["content"]);
+		expect(app.vault.cachedRead).toHaveBeenCalledTimes(2);
+	});
+
+	it("rescans backlinks after invalidation", async () => {
+		await collector.collectNoteContext(file, ["backlinks"]);
+		app.metadataCache.resolvedLinks["other.md"] = {"notes/note.md": 1};
+
+		expect(await collector.collectNoteContext(file, ["backlinks"])).toEqual({backlinks: "index.md"});
+		cache.invalidate("other.md");
+		expect(await collector.collectNoteContext(file, ["backlinks"])).toEqual({backlinks: "index.md\nother.md"});
+	});
+
+	it("rescans outgoing links when another note changes", async () => {
+		await collector.collectNoteContext(file, ["links"]);
+		app.metadataCache.resolvedLinks["notes/note.md"] = {"notes/setup.md": 1, "notes/new.md": 1};
+
+		expect(await collector.collectNoteContext(file, ["links"])).toEqual({links: "notes/setup.md"});
+		cache.invalidate("notes/new.md");
+		expect(await collector.collectNoteContext(file, ["links"])).toEqual({links: "notes/setup.md\nnotes/new.md"});
+	});
+
+	it("caches resolved filesystem paths", () => {
+		expect(collector.getFilePath(file)).toBe("/vault/notes/note.md");
+		expect(collector.getDirectoryPath(file)).toBe("/vault/notes");
+		expect(collector.getVaultPath()).toBe("/vault");
+		collector.getFilePath(file);
+		collector.getVaultPath();
+
+		expect(app.vault.adapter.getBasePath).toHaveBeenCalledTimes(2);
+	});
+});
@@ -1,11 +1,15 @@
-import {TFile, App} from "obsidian";
-import {ExecutionContext} from "../types";
+import {TFile, App, getAllTags} from "obsidian";
+import {ExecutionContext, NoteContext, RICH_PLACEHOLDERS, RichPlaceholder} from "../types";
+import {NoteContextCache} from "./note-context-cache";
 
 /**
  * Collect execution context from various sources
  */
 export class ContextCollector {
-	constructor(private app: App) {}
+	constructor(
+		private app: App,
+		private cache: NoteContextCache = new NoteContextCache()
+	) {}
 
 	/**
 	 * Normalize path separators for Windows
@@ -49,10 +53,75 @@ export class ContextCollector {
 		};
 	}
 
+	/**
+	 * Load rich placeholder values for a file, limited to the given placeholder names
+	 */
+	async collectNoteContext(file: TFile, names: Iterable<string>): Promise<NoteContext> {
+		const noteContext: NoteContext = {};
+		for (const name of names) {
+			if (RICH_PLACEHOLDERS.includes(name as RichPlaceholder)) {
+				const placeholder = name as RichPlaceholder;
+				noteContext[placeholder] = await this.getNoteValue(file, placeholder);
+			}
+		}
+		return noteContext;
+	}
+
+	private getNoteValue(file: TFile, name: RichPlaceholder): Promise<string> | string {
+		if (name === "links") {
+			return this.cache.getLinkValue(file.path, name, () => this.findLinks(file));
+		}
+		if (name === "backlinks") {
+			return this.cache.getLinkValue(file.path, name, () => this.findBacklinks(file));
+		}
+		return this.cache.getNoteValue(file, name, () => {
+			switch (name) {
+				case "content":
+					return this.app.vault.cachedRead(file);
+				case "frontmatter": {
+					const frontmatter = this.app.metadataCache.getFileCache(file)?.frontmatter;
+					return frontmatter ? JSON.stringify(frontmatter) : "";
+				}
+				case "tags": {
+					const metadata = this.app.metadataCache.getFileCache(file);
+					const tags = metadata ? getAllTags(metadata) ?? [] : [];
+					return Array.from(new Set(tags)).join(" ");
+				}
+				default:
+					return "";
+			}
+		});
+	}
+
+	/**
+	 * List notes the file links to
+	 */
+	private findLinks(file: TFile): string {
+		return Object.keys(this.app.metadataCache.resolvedLinks[file.path] ?? {}).join("\n");
+	}
+
+	/**
+	 * Scan resolved links for notes that link to the file
+	 */
+	private findBacklinks(file: TFile): string {
+		const sources: string[] = [];
+		const resolvedLinks = this.app.metadataCache.resolvedLinks;
+		for (const source of Object.keys(resolvedLinks)) {
+			if (source !== file.path && resolvedLinks[source]?.[file.path]) {
+				sources.push(source);
+			}
+		}
+		return sources.join("\n");
+	}
+
 	/**
 	 * Get file path from TFile
 	 */
 	getFilePath(file: TFile): string {
+		return this.cache.getPath(`file:${file.path}`, () => this.computeFilePath(file));
+	}
+
+	private computeFilePath(file: TFile): string {
 		const adapter = this.app.vault.adapter;
 		
 		// Use getBasePath + relative path for reliable filesystem path
@@ -81,6 +150,10 @@ export class ContextCollector {
 	 * Get vault path
 	 */
 	getVaultPath(): string {
+		return this.cache.getPath("vault", () => this.computeVaultPath());
+	}
+
+	private computeVaultPath(): string {
 		const adapter = this.app.vault.adapter;
 		
 		if ('getBasePath' in adapter && typeof adapter.getBasePath === 'function') {
@@ -95,6 +168,10 @@ export class ContextCollector {
 	 * Get directory path from file
 	 */
 	getDirectoryPath(file: TFile): string {
+		return this.cache.getPath(`dir:${file.path}`, () => this.computeDirectoryPath(file));
+	}
+
+	private computeDirectoryPath(file: TFile): string {
 		const fullPath = this.getFilePath(file);
 		// After normalization, paths use backslash on Windows, forward slash on Unix
 		const lastSlash = Math.max(fullPath.lastIndexOf("/"), fullPath.lastIndexOf("\\"));
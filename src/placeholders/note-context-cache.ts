@@ -0,0 +1,84 @@
+import {TFile} from "obsidian";
+import {LruCache} from "../utils/lru-cache";
+
+const MAX_CACHED_NOTES = 32;
+const MAX_CACHED_PATHS = 512;
+
+interface CachedNote {
+	/** Note mtime when the values were computed */
+	mtime: number;
+
+	/** Computed values by placeholder name */
+	values: Map<string, string>;
+}
+
+/**
+ * LRU cache for per-note placeholder values and resolved filesystem paths.
+ * Note values are keyed by path and mtime; call invalidate() on vault changes.
+ */
+export class NoteContextCache {
+	private notes = new LruCache<string, CachedNote>(MAX_CACHED_NOTES);
+	private links = new LruCache<string, string>(MAX_CACHED_NOTES * 2);
+	private paths = new LruCache<string, string>(MAX_CACHED_PATHS);
+
+	/**
+	 * Get a per-note value, computing it when missing or the note changed
+	 */
+	async getNoteValue(
+		file: TFile,
+		name: string,
+		compute: () => string | Promise<string>
+	): Promise<string> {
+		const mtime = file.stat.mtime;
+		let note = this.notes.get(file.path);
+		if (!note || note.mtime !== mtime) {
+			note = {mtime, values: new Map()};
+			this.notes.set(file.path, note);
+		}
+
+		const cached = note.values.get(name);
+		if (cached !== undefined) {
+			return cached;
+		}
+
+		const value = await compute();
+		note.values.set(name, value);
+		return value;
+	}
+
+	/**
+	 * Get a link-derived value (`links`, `backlinks`) for a note.
+	 * Cleared on any vault change since resolved links depend on other notes.
+	 */
+	getLinkValue(path: string, name: string, compute: () => string): string {
+		const key = `${name}:${path}`;
+		let value = this.links.get(key);
+		if (value === undefined) {
+			value = compute();
+			this.links.set(key, value);
+		}
+		return value;
+	}
+
+	/**
+	 * Get a resolved filesystem path (e.g. `file:notes/a.md`)
+	 */
+	getPath(key: string, compute: () => string): string {
+		let value = this.paths.get(key);
+		if (value === undefined) {
+			value = compute();
+			this.paths.set(key, value);
+		}
+		return value;
+	}
+
+	/**
+	 * Drop cached values for a changed, renamed or deleted note
+	 */
+	invalidate(path: string): void {
+		this.notes.delete(path);
+		this.paths.delete(`file:${path}`);
+		this.paths.delete(`dir:${path}`);
+		this.links.clear();
+	}
+}
@@ -0,0 +1,37 @@
+import {bench, describe} from "vitest";
+import {PlaceholderResolver} from "./placeholder-resolver";
+import {
+	createCommandTemplates,
+	createContext,
+	createContextCollector,
+	createSelection,
+	getBenchOptions,
+	PAYLOAD_SIZES,
+	PROMPT_TEMPLATE
+} from "../__bench__/fixtures";
+
+const templates = createCommandTemplates();
+
+describe.each(PAYLOAD_SIZES)("resolveForShell (%s selection)", (_label, length) => {
+	const resolver = new PlaceholderResolver(createContextCollector());
+	const context = {...createContext(createSelection(length)), prompt: PROMPT_TEMPLATE};
+	let next = 0;
+
+	(["powershell", "bash"] as const).forEach(shell => {
+		bench(shell, () => {
+			const template = templates[next++ % templates.length] ?? "";
+			resolver.resolveForShell(template, context, {agentCommand: "Build"}, shell);
+		}, getBenchOptions(length));
+	});
+});
+
+describe.each(PAYLOAD_SIZES)("resolve + escapeShell (%s selection)", (_label, length) => {
+	const resolver = new PlaceholderResolver(createContextCollector());
+	const context = {...createContext(createSelection(length)), prompt: PROMPT_TEMPLATE};
+	let next = 0;
+
+	bench("legacy resolve", () => {
+		const template = templates[next++ % templates.length] ?? "";
+		resolver.resolve(template, context, {agentCommand: "Build"});
+	}, getBenchOptions(length));
+});
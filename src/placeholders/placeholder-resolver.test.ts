@@ -319,6 +319,112 @@ describe("PlaceholderResolver", () => {
 		});
 	});
 
+	describe("resolveForShell - offloaded payloads", () => {
+		it("should resolve <selection-file> and <prompt-file> to escaped paths", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				payloadFiles: {
+					selection: "/vault/payloads/selection-1.txt",
+					prompt: "/vault/payloads/prompt-1.txt"
+				}
+			};
+			const template = "agent --context <selection-file> --prompt-file <prompt-file>";
+			const result = resolver.resolveForShell(template, context, {}, "bash");
+
+			expect(result).toBe("agent --context '/vault/payloads/selection-1.txt' --prompt-file '/vault/payloads/prompt-1.txt'");
+		});
+
+		it("should read an offloaded selection from its file in Bash", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				selection: "large selection",
+				payloadFiles: {selection: "/vault/payloads/selection-1.txt"}
+			};
+			const result = resolver.resolveForShell("copilot -i <selection>", context, {}, "bash");
+
+			expect(result).toBe("copilot -i \"$(cat '/vault/payloads/selection-1.txt')\"");
+		});
+
+		it("should read an offloaded prompt from its file in PowerShell", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				prompt: "large prompt",
+				payloadFiles: {prompt: "C:\\vault\\payloads\\prompt-1.txt"}
+			};
+			const result = resolver.resolveForShell("copilot -i \"<prompt>\"", context, {}, "powershell");
+
+			expect(result).toBe(
+				"copilot -i ((Get-Content -Raw -Encoding UTF8 -LiteralPath 'C:\\vault\\payloads\\prompt-1.txt') -replace '\"', '\\\"')"
+			);
+		});
+
+		it("should keep embedded placeholders inline even when offloaded", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				selection: "It's large",
+				prompt: "Say \"hi\"",
+				payloadFiles: {
+					selection: "/vault/payloads/selection-1.txt",
+					prompt: "C:\\vault\\payloads\\prompt-1.txt"
+				}
+			};
+
+			expect(resolver.resolveForShell("claude 'Review: <selection>'", context, {}, "bash"))
+				.toBe("claude 'Review: 'It'\\''s large''");
+			expect(resolver.resolveForShell("copilot -i \"Review: <prompt>\"", context, {}, "powershell"))
+				.toBe("copilot -i \"Review: 'Say \\\"hi\\\"'\"");
+		});
+
+		it("should reuse a prompt already rendered by the executor", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				prompt: "Review <file>",
+				resolvedPrompt: "Review cached.md"
+			};
+			const result = resolver.resolveForShell("copilot -i <prompt>", context, {}, "bash");
+
+			expect(result).toBe("copilot -i 'Review cached.md'");
+		});
+
+		it("should resolve the prompt without shell escaping", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				file: mockFile,
+				selection: "It's \"ok\""
+			};
+			const result = resolver.resolvePrompt(context, {defaultPrompt: "Review <file>: <selection>"});
+
+			expect(result).toBe("Review Welcome.md: It's \"ok\"");
+		});
+	});
+
+	describe("resolveForShell - rich placeholders", () => {
+		it("should resolve rich placeholders from preloaded note context", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				file: mockFile,
+				noteContext: {content: "It's here", tags: "#docs"}
+			};
+			const result = resolver.resolveForShell("agent <content> <tags> <backlinks>", context, {}, "bash");
+
+			expect(result).toBe("agent 'It'\\''s here' '#docs' ''");
+		});
+
+		it("should read offloaded rich placeholders only where they are whole arguments", () => {
+			const context: ExecutionContext = {
+				vault: mockVault,
+				file: mockFile,
+				noteContext: {content: "large note", backlinks: "index.md"},
+				payloadFiles: {content: "/vault/payloads/content-1.txt"}
+			};
+
+			expect(resolver.resolveForShell("agent <content> <backlinks>", context, {}, "bash"))
+				.toBe("agent \"$(cat '/vault/payloads/content-1.txt')\" 'index.md'");
+			expect(resolver.resolveForShell("agent 'Note: <content>'", context, {}, "bash"))
+				.toBe("agent 'Note: 'large note''");
+		});
+	});
+
 	describe("getWorkingDirectory", () => {
 		it("should always return vault root when file context is present", () => {
 			const context: ExecutionContext = {
@@ -1,16 +1,51 @@
 import {TFile} from "obsidian";
-import {ExecutionContext} from "../types";
+import {ExecutionContext, PayloadKind, RICH_PLACEHOLDERS} from "../types";
 import {ContextCollector} from "./context-collector";
+import {renderTemplate, TemplateCompiler} from "./template-compiler";
+
+const escapeForPowerShell = (value: string): string => {
+	const escaped = value.replace(/["']/g, char => (char === "\"" ? "\\\"" : "''"));
+	return `'${escaped}'`;
+};
+
+const escapeForBash = (value: string): string => {
+	const escaped = value.replace(/'/g, "'\\''");
+	return `'${escaped}'`;
+};
+
+/** Inline escapers for each supported shell */
+const SHELL_ESCAPERS: Record<"powershell" | "bash", (value: string) => string> = {
+	powershell: escapeForPowerShell,
+	bash: escapeForBash
+};
+
+/**
+ * Shell expressions that expand to the contents of an offloaded payload file.
+ * PowerShell re-applies the inline quote escaping for native argument passing.
+ */
+const SHELL_FILE_READERS: Record<"powershell" | "bash", (filePath: string) => string> = {
+	powershell: filePath => `((Get-Content -Raw -Encoding UTF8 -LiteralPath ${escapeForPowerShell(filePath)}) -replace '"', '\\"')`,
+	bash: filePath => `"$(cat ${escapeForBash(filePath)})"`
+};
+
+/** Placeholders whose value can be read back from an offloaded payload file */
+const OFFLOADABLE_PLACEHOLDERS = new Set<string>(["selection", "prompt", ...RICH_PLACEHOLDERS]);
 
 /**
  * Resolves placeholders in command templates
  */
 export class PlaceholderResolver {
-	constructor(private contextCollector: ContextCollector) {}
+	constructor(
+		private contextCollector: ContextCollector,
+		private compiler: TemplateCompiler = new TemplateCompiler()
+	) {}
 
 	/**
 	 * Resolve placeholders for a specific shell with inline escaping.
 	 *
+	 * The template and prompt are compiled once and rendered in a single pass;
+	 * each referenced value is computed and escaped at most once.
+	 *
 	 * @param template Command template containing placeholders.
 	 * @param context Execution context data.
 	 * @param defaults Default prompt/agent fallback values.
@@ -23,35 +58,58 @@ export class PlaceholderResolver {
 		defaults: { defaultPrompt?: string; agentCommand?: string },
 		shell: "powershell" | "bash"
 	): string {
-		const rawValues = this.getRawPlaceholderValues(context);
-		const escape = shell === "powershell"
-			? this.escapeForPowerShell.bind(this)
-			: this.escapeForBash.bind(this);
+		const compiled = this.compiler.compile(template);
+		const escape = SHELL_ESCAPERS[shell];
+		const getRawValue = this.createValueLookup(context);
+		const escapedValues = new Map<string, string>();
+		const payloadFiles = context.payloadFiles ?? {};
 
-		let promptValue = context.prompt || defaults.defaultPrompt || "";
-		promptValue = this.replacePlaceholdersWithValues(promptValue, rawValues);
-		const agentValue = context.agent || defaults.agentCommand || "";
+		const getShellValue = (name: string): string => {
+			switch (name) {
+				case "prompt":
+					return context.resolvedPrompt ?? this.renderPrompt(context, defaults, getRawValue);
+				case "agent":
+					return context.agent || defaults.agentCommand || "";
+				case "prompt-file":
+					return payloadFiles.prompt ?? "";
+				default:
+					return getRawValue(name) ?? "";
+			}
+		};
 
-		let resolved = template;
-		const replacements = [
-			{token: "<prompt>", value: promptValue},
-			{token: "<agent>", value: agentValue},
-			{token: "<file>", value: rawValues.file},
-			{token: "<path>", value: rawValues.path},
-			{token: "<relative-path>", value: rawValues.relativePath},
-			{token: "<dir>", value: rawValues.dir},
-			{token: "<vault>", value: rawValues.vault},
-			{token: "<selection>", value: rawValues.selection}
-		];
-
-		replacements.forEach(({token, value}) => {
-			const escaped = escape(value);
-			resolved = resolved.split(`"${token}"`).join(escaped);
-			resolved = resolved.split(`'${token}'`).join(escaped);
-			resolved = resolved.split(token).join(escaped);
-		});
+		return renderTemplate(compiled, name => {
+			let escaped = escapedValues.get(name);
+			if (escaped === undefined) {
+				// A file read only works as a whole argument; embedded values stay inline
+				const offloaded = OFFLOADABLE_PLACEHOLDERS.has(name) && compiled.standalonePlaceholders.has(name)
+					? payloadFiles[name as PayloadKind]
+					: undefined;
+				escaped = offloaded
+					? SHELL_FILE_READERS[shell](offloaded)
+					: escape(getShellValue(name));
+				escapedValues.set(name, escaped);
+			}
+			return escaped;
+		}, false);
+	}
 
-		return resolved;
+	/**
+	 * Resolve the prompt text with nested placeholders, without shell escaping
+	 */
+	resolvePrompt(
+		context: ExecutionContext,
+		defaults: { defaultPrompt?: string }
+	): string {
+		return this.renderPrompt(context, defaults, this.createValueLookup(context));
+	}
+
+	private renderPrompt(
+		context: ExecutionContext,
+		defaults: { defaultPrompt?: string },
+		getRawValue: (name: string) => string | undefined
+	): string {
+		const compiled = this.compiler.compilePrompt(context.prompt, defaults.defaultPrompt);
+		return renderTemplate(compiled, getRawValue, true);
 	}
 
 	/**
@@ -82,46 +140,52 @@ export class PlaceholderResolver {
 		return resolved;
 	}
 
-	private getRawPlaceholderValues(context: ExecutionContext): {
-		file: string;
-		path: string;
-		relativePath: string;
-		dir: string;
-		vault: string;
-		selection: string;
-	} {
-		let file = "";
-		let path = "";
-		let relativePath = "";
-		let dir = "";
-		if (context.file) {
-			file = context.file.name;
-			path = this.contextCollector.getFilePath(context.file);
-			relativePath = this.contextCollector.getRelativePath(context.file);
-			dir = this.contextCollector.getDirectoryPath(context.file);
-		}
-
-		return {
-			file,
-			path,
-			relativePath,
-			dir,
-			vault: this.contextCollector.getVaultPath(),
-			selection: context.selection || ""
+	/**
+	 * Create a memoized lookup for unescaped placeholder values.
+	 * <prompt>, <agent> and <prompt-file> are not resolved here and stay verbatim.
+	 */
+	private createValueLookup(context: ExecutionContext): (name: string) => string | undefined {
+		const values = new Map<string, string>();
+		return (name: string) => {
+			let value = values.get(name);
+			if (value === undefined) {
+				value = this.getRawPlaceholderValue(name, context);
+				if (value !== undefined) {
+					values.set(name, value);
+				}
+			}
+			return value;
 		};
 	}
 
-	private replacePlaceholdersWithValues(
-		text: string,
-		values: {file: string; path: string; relativePath: string; dir: string; vault: string; selection: string;}
-	): string {
-		return text
-			.replace(/<file>/g, values.file)
-			.replace(/<path>/g, values.path)
-			.replace(/<relative-path>/g, values.relativePath)
-			.replace(/<dir>/g, values.dir)
-			.replace(/<vault>/g, values.vault)
-			.replace(/<selection>/g, values.selection);
+	private getRawPlaceholderValue(name: string, context: ExecutionContext): string | undefined {
+		const file = context.file;
+		switch (name) {
+			case "file":
+				return file ? file.name : "";
+			case "path":
+				return file ? this.contextCollector.getFilePath(file) : "";
+			case "relative-path":
+				return file ? this.contextCollector.getRelativePath(file) : "";
+			case "dir":
+				return file ? this.contextCollector.getDirectoryPath(file) : "";
+			case "vault":
+				return this.contextCollector.getVaultPath();
+			case "selection":
+				return context.selection || "";
+			case "selection-file":
+				return context.payloadFiles?.selection ?? "";
+			case "manifest-file":
+				return context.payloadFiles?.manifest ?? "";
+			case "content":
+			case "frontmatter":
+			case "tags":
+			case "links":
+			case "backlinks":
+				return context.noteContext?.[name] ?? "";
+			default:
+				return undefined;
+		}
 	}
 
 	/**
@@ -176,19 +240,6 @@ export class PlaceholderResolver {
 		return result;
 	}
 
-	private escapeForPowerShell(value: string): string {
-		const escaped = value
-			.replace(/"/g, '\\"')
-			.replace(/'/g, "''")
-			;
-		return `'${escaped}'`;
-	}
-
-	private escapeForBash(value: string): string {
-		const escaped = value.replace(/'/g, "'\\''");
-		return `'${escaped}'`;
-	}
-
 	/**
 	 * Escape shell special characters to prevent command injection
 	 * For PowerShell with Base64 encoding:
@@ -213,7 +264,7 @@ export class PlaceholderResolver {
 	 * Check if template requires file context
 	 */
 	requiresFileContext(template: string): boolean {
-		return /<file>|<path>|<relative-path>|<dir>/.test(template);
+		return this.compiler.requiresFileContext(template);
 	}
 
 	/**
@@ -0,0 +1,84 @@
+import {describe, expect, it} from "vitest";
+import {renderTemplate, TemplateCompiler} from "./template-compiler";
+
+describe("TemplateCompiler", () => {
+	it("splits a template into literal and placeholder segments", () => {
+		const compiler = new TemplateCompiler();
+		const compiled = compiler.compile("copilot --agent <agent> -i <prompt>");
+
+		expect(compiled.segments).toEqual([
+			{kind: "literal", text: "copilot --agent "},
+			{kind: "placeholder", name: "agent"},
+			{kind: "literal", text: " -i "},
+			{kind: "placeholder", name: "prompt"}
+		]);
+		expect(Array.from(compiled.placeholders)).toEqual(["agent", "prompt"]);
+	});
+
+	it("records quote context for wrapped placeholders", () => {
+		const compiler = new TemplateCompiler();
+		const compiled = compiler.compile(`run "<prompt>" '<selection>' "<file>`);
+
+		expect(compiled.segments).toEqual([
+			{kind: "literal", text: "run "},
+			{kind: "placeholder", name: "prompt", quote: "\""},
+			{kind: "literal", text: " "},
+			{kind: "placeholder", name: "selection", quote: "'"},
+			{kind: "literal", text: " \""},
+			{kind: "placeholder", name: "file"}
+		]);
+	});
+
+	it("reports unknown placeholders and keeps them as literals", () => {
+		const compiler = new TemplateCompiler();
+		const compiled = compiler.compile("run <unknown> <file>");
+
+		expect(compiled.unknownPlaceholders).toEqual(["unknown"]);
+		expect(renderTemplate(compiled, () => "X", false)).toBe("run <unknown> X");
+	});
+
+	it("caches compiled templates", () => {
+		const compiler = new TemplateCompiler();
+		const first = compiler.compile("<prompt>");
+
+		expect(compiler.compile("<prompt>")).toBe(first);
+	});
+
+	it("does not cache ad-hoc prompts", () => {
+		const compiler = new TemplateCompiler();
+		const stored = compiler.compilePrompt(undefined, "Review <file>");
+		const adHoc = compiler.compilePrompt("Explain <selection>", "Review <file>");
+
+		expect(compiler.compilePrompt("", "Review <file>")).toBe(stored);
+		expect(Array.from(adHoc.placeholders)).toEqual(["selection"]);
+		expect(compiler.compilePrompt("Explain <selection>", undefined)).not.toBe(adHoc);
+	});
+
+	it("detects placeholders that are whole shell arguments", () => {
+		const compiler = new TemplateCompiler();
+		const standalone = (template: string) => Array.from(compiler.compile(template).standalonePlaceholders);
+
+		expect(standalone("copilot -i <prompt> --context \"<selection>\"")).toEqual(["prompt", "selection"]);
+		expect(standalone("claude 'Review: <selection>'")).toEqual([]);
+		expect(standalone("copilot -i \"Review: <prompt> now\"")).toEqual([]);
+		expect(standalone("run <file><selection>")).toEqual([]);
+		expect(standalone("run <selection> 'x <selection>'")).toEqual([]);
+		// An escaped quote does not open a quoted string
+		expect(standalone("echo \\\" <prompt>")).toEqual(["prompt"]);
+	});
+
+	it("detects file placeholders", () => {
+		const compiler = new TemplateCompiler();
+
+		expect(compiler.requiresFileContext("edit <relative-path>")).toBe(true);
+		expect(compiler.requiresFileContext("copilot -i <prompt>")).toBe(false);
+	});
+
+	it("does not re-expand placeholders inside rendered values", () => {
+		const compiler = new TemplateCompiler();
+		const compiled = compiler.compile("<selection> <file>");
+		const values: Record<string, string> = {selection: "<file> $&", file: "note.md"};
+
+		expect(renderTemplate(compiled, name => values[name], false)).toBe("<file> $& note.md");
+	});
+});
@@ -0,0 +1,235 @@
+import {AVAILABLE_PLACEHOLDERS, RICH_PLACEHOLDERS} from "../types";
+import {LruCache} from "../utils/lru-cache";
+
+/**
+ * Quote character that directly wraps a placeholder in the template
+ */
+export type QuoteContext = "\"" | "'";
+
+/**
+ * Segment of a compiled template
+ */
+export type TemplateSegment =
+	| { kind: "literal"; text: string }
+	| { kind: "placeholder"; name: string; quote?: QuoteContext };
+
+/**
+ * Parsed representation of a command template or prompt
+ */
+export interface CompiledTemplate {
+	/** Original template string */
+	source: string;
+
+	/** Literal and placeholder segments in template order */
+	segments: TemplateSegment[];
+
+	/** Known placeholder names referenced by the template */
+	placeholders: Set<string>;
+
+	/** Unknown `<...>` tokens, in the order they appear */
+	unknownPlaceholders: string[];
+
+	/**
+	 * Placeholders that only appear as whole shell arguments (`<x>`, `"<x>"` or `'<x>'`
+	 * separated by whitespace and outside any open quote), so their value can be
+	 * replaced by a shell expression such as a file read
+	 */
+	standalonePlaceholders: Set<string>;
+}
+
+/** Placeholders that can only be resolved with an active file */
+export const FILE_PLACEHOLDERS: string[] = ["file", "path", "relative-path", "dir", ...RICH_PLACEHOLDERS];
+
+const MAX_CACHED_TEMPLATES = 256;
+
+/**
+ * Find placeholders whose every occurrence is a whole shell argument.
+ * Quotes are tracked approximately: `\` and `` ` `` escape the next character outside single quotes.
+ */
+function findStandalonePlaceholders(segments: TemplateSegment[]): Set<string> {
+	const standalone = new Set<string>();
+	const embedded = new Set<string>();
+	let openQuote: QuoteContext | null = null;
+
+	segments.forEach((segment, index) => {
+		if (segment.kind === "literal") {
+			const {text} = segment;
+			for (let i = 0; i < text.length; i++) {
+				const char = text.charAt(i);
+				if (openQuote !== "'" && (char === "\\" || char === "`")) {
+					i += 1;
+				} else if (openQuote === null && (char === "\"" || char === "'")) {
+					openQuote = char;
+				} else if (char === openQuote) {
+					openQuote = null;
+				}
+			}
+			return;
+		}
+
+		const before = segments[index - 1];
+		const after = segments[index + 1];
+		const startsArgument = !before || (before.kind === "literal" && /\s$/.test(before.text));
+		const endsArgument = !after || (after.kind === "literal" && /^\s/.test(after.text));
+		if (openQuote === null && startsArgument && endsArgument) {
+			standalone.add(segment.name);
+		} else {
+			embedded.add(segment.name);
+		}
+	});
+
+	embedded.forEach(name => standalone.delete(name));
+	return standalone;
+}
+
+/**
+ * Parse a template string into literal and placeholder segments.
+ *
+ * A placeholder wrapped directly in matching quotes (`"<prompt>"` or `'<prompt>'`)
+ * records the quote context so renderers can drop the redundant quotes.
+ *
+ * @param source Template string to parse.
+ * @param knownPlaceholders Placeholder names that are recognized.
+ * @returns Compiled template.
+ */
+export function parseTemplate(source: string, knownPlaceholders: Set<string>): CompiledTemplate {
+	const segments: TemplateSegment[] = [];
+	const placeholders = new Set<string>();
+	const unknownPlaceholders: string[] = [];
+	let literal = "";
+	let cursor = 0;
+	let scan = 0;
+	// End of the last unknown `<...>` match, so nested tokens are reported once
+	let unknownEnd = 0;
+
+	while (scan < source.length) {
+		const open = source.indexOf("<", scan);
+		if (open === -1) {
+			break;
+		}
+		const close = source.indexOf(">", open + 1);
+		if (close === -1) {
+			break;
+		}
+
+		const name = source.slice(open + 1, close);
+		if (name.length === 0) {
+			scan = open + 1;
+			continue;
+		}
+
+		if (!knownPlaceholders.has(name)) {
+			if (open >= unknownEnd) {
+				unknownPlaceholders.push(name);
+				unknownEnd = close + 1;
+			}
+			scan = open + 1;
+			continue;
+		}
+
+		literal += source.slice(cursor, open);
+		let end = close + 1;
+		let quote: QuoteContext | undefined;
+		const before = literal.charAt(literal.length - 1);
+		if ((before === "\"" || before === "'") && source.charAt(end) === before) {
+			quote = before;
+			literal = literal.slice(0, -1);
+			end += 1;
+		}
+
+		if (literal.length > 0) {
+			segments.push({kind: "literal", text: literal});
+			literal = "";
+		}
+		segments.push(quote ? {kind: "placeholder", name, quote} : {kind: "placeholder", name});
+		placeholders.add(name);
+		cursor = end;
+		scan = end;
+	}
+
+	literal += source.slice(cursor);
+	if (literal.length > 0) {
+		segments.push({kind: "literal", text: literal});
+	}
+
+	return {
+		source,
+		segments,
+		placeholders,
+		unknownPlaceholders,
+		standalonePlaceholders: findStandalonePlaceholders(segments)
+	};
+}
+
+/**
+ * Compiles templates once and caches the parsed form by template string
+ */
+export class TemplateCompiler {
+	private cache = new LruCache<string, CompiledTemplate>(MAX_CACHED_TEMPLATES);
+	private knownPlaceholders = new Set(AVAILABLE_PLACEHOLDERS.map(p => p.name));
+
+	/**
+	 * Get the compiled form of a template, parsing it on first use
+	 */
+	compile(template: string): CompiledTemplate {
+		const cached = this.cache.get(template);
+		if (cached) {
+			return cached;
+		}
+
+		const compiled = parseTemplate(template, this.knownPlaceholders);
+		this.cache.set(template, compiled);
+		return compiled;
+	}
+
+	/**
+	 * Compile the prompt for a launch. Ad-hoc prompts (e.g. pasted into the direct prompt modal)
+	 * are parsed without caching; stored default prompts go through the cache.
+	 */
+	compilePrompt(prompt: string | undefined, defaultPrompt: string | undefined): CompiledTemplate {
+		return prompt
+			? parseTemplate(prompt, this.knownPlaceholders)
+			: this.compile(defaultPrompt ?? "");
+	}
+
+	/**
+	 * Check if a template references any file placeholder
+	 */
+	requiresFileContext(template: string): boolean {
+		const {placeholders} = this.compile(template);
+		return FILE_PLACEHOLDERS.some(name => placeholders.has(name));
+	}
+}
+
+/**
+ * Render a compiled template in a single pass.
+ *
+ * @param compiled Compiled template.
+ * @param getValue Returns the rendered value for a placeholder, or undefined to keep it verbatim.
+ * @param keepQuotes Whether quotes around placeholders are emitted with the value.
+ * @returns Rendered string.
+ */
+export function renderTemplate(
+	compiled: CompiledTemplate,
+	getValue: (name: string) => string | undefined,
+	keepQuotes: boolean
+): string {
+	const parts: string[] = [];
+	for (const segment of compiled.segments) {
+		if (segment.kind === "literal") {
+			parts.push(segment.text);
+			continue;
+		}
+
+		const value = getValue(segment.name);
+		const quote = segment.quote ?? "";
+		if (value === undefined) {
+			parts.push(`${quote}<${segment.name}>${quote}`);
+		} else if (keepQuotes) {
+			parts.push(quote, value, quote);
+		} else {
+			parts.push(value);
+		}
+	}
+	return parts.join("");
+}
@@ -0,0 +1,114 @@
+import {afterEach, beforeEach, describe, expect, it, vi} from "vitest";
+import {SettingsStore} from "./settings-store";
+import {createDefaultSettings} from "./settings";
+import {AITerminalSettings} from "./types";
+import {createCommand} from "./__tests__/fixtures";
+
+describe("SettingsStore", () => {
+	let settings: AITerminalSettings;
+	let persist: ReturnType<typeof vi.fn>;
+	let store: SettingsStore;
+
+	beforeEach(() => {
+		vi.useFakeTimers();
+		settings = createDefaultSettings();
+		settings.commands = ["a", "b", "c"].map(id => createCommand(id));
+		persist = vi.fn(async () => {});
+		store = new SettingsStore(() => settings, persist, 500);
+	});
+
+	afterEach(() => {
+		vi.useRealTimers();
+	});
+
+	it("looks up commands and agents by id", () => {
+		expect(store.getCommand("b")?.name).toBe("Command b");
+		expect(store.getCommandIndex("c")).toBe(2);
+		expect(store.getCommandIndex("missing")).toBe(-1);
+		expect(store.getAgent(settings.agents[0]?.id ?? "")).toBe(settings.agents[0]);
+	});
+
+	it("keeps the index correct after the list is reordered or replaced", () => {
+		expect(store.getCommandIndex("a")).toBe(0);
+
+		settings.commands.reverse();
+		expect(store.getCommandIndex("a")).toBe(2);
+
+		settings.commands.splice(0, 1);
+		expect(store.getCommand("c")).toBeUndefined();
+
+		settings.commands = [createCommand("d")];
+		expect(store.getCommandIndex("d")).toBe(0);
+		expect(store.getCommand("a")).toBeUndefined();
+	});
+
+	it("swaps commands without rebuilding the index", () => {
+		const listener = vi.fn();
+		store.onChange(listener);
+		expect(store.getCommandIndex("a")).toBe(0);
+		const rebuild = vi.spyOn((store as any).commandIndex, "rebuild");
+
+		store.swapCommands(0, 1);
+		store.swapCommands(1, 2);
+
+		expect(settings.commands.map(command => command.id)).toEqual(["b", "c", "a"]);
+		expect(store.getCommandIndex("a")).toBe(2);
+		expect(store.getCommandIndex("b")).toBe(0);
+		expect(store.getCommandIndex("c")).toBe(1);
+		expect(rebuild).not.toHaveBeenCalled();
+		expect(listener).toHaveBeenCalledTimes(2);
+	});
+
+	it("coalesces rapid updates into one write", async () => {
+		store.update({scope: "commands"});
+		store.update({scope: "commands"});
+		vi.advanceTimersByTime(499);
+		store.update();
+		expect(persist).not.toHaveBeenCalled();
+
+		await vi.advanceTimersByTimeAsync(500);
+		expect(persist).toHaveBeenCalledTimes(1);
+		expect(persist).toHaveBeenCalledWith(settings);
+		await store.flush();
+		expect(persist).toHaveBeenCalledTimes(1);
+	});
+
+	it("writes pending changes on flush and skips clean flushes", async () => {
+		await store.flush();
+		expect(persist).not.toHaveBeenCalled();
+
+		store.update();
+		await store.flush();
+		expect(persist).toHaveBeenCalledTimes(1);
+
+		await vi.advanceTimersByTimeAsync(1000);
+		expect(persist).toHaveBeenCalledTimes(1);
+	});
+
+	it("keeps changes dirty when a write fails", async () => {
+		const errorSpy = vi.spyOn(console, "error").mockImplementation(() => {});
+		persist.mockRejectedValueOnce(new Error("disk full"));
+
+		store.update();
+		await store.flush();
+		expect(persist).toHaveBeenCalledTimes(1);
+
+		// The failed change is still pending, and written only once
+		await store.flush();
+		await store.flush();
+		expect(persist).toHaveBeenCalledTimes(2);
+		errorSpy.mockRestore();
+	});
+
+	it("notifies listeners until they unsubscribe", () => {
+		const listener = vi.fn();
+		const unsubscribe = store.onChange(listener);
+
+		store.update({scope: "commands"});
+		expect(listener).toHaveBeenCalledWith({scope: "commands"});
+
+		unsubscribe();
+		store.update();
+		expect(listener).toHaveBeenCalledTimes(1);
+	});
+});
@@ -0,0 +1,157 @@
+import {AgentConfig, AITerminalSettings, CommandTemplate} from "./types";
+
+/**
+ * What changed in the settings: only the command list, or anything
+ */
+export type SettingsChange =
+	| { scope: "commands" }
+	| { scope: "all" };
+
+export type SettingsChangeListener = (change: SettingsChange) => void;
+
+/** Writes requested within this window are coalesced into one */
+export const DEFAULT_SAVE_DELAY_MS = 500;
+
+/**
+ * Id to array position index that revalidates itself on lookup.
+ * Swaps made through swap() keep it current; a position that no longer holds the id
+ * (after a splice or array replacement) triggers a rebuild.
+ */
+class IdIndex<T extends { id: string }> {
+	private positions = new Map<string, number>();
+	private source: T[] | null = null;
+
+	indexOf(items: T[], id: string): number {
+		const index = this.source === items ? this.positions.get(id) : undefined;
+		if (index !== undefined && items[index]?.id === id) {
+			return index;
+		}
+		this.rebuild(items);
+		return this.positions.get(id) ?? -1;
+	}
+
+	/**
+	 * Record that the items at two positions traded places
+	 */
+	swap(items: T[], index: number, otherIndex: number): void {
+		if (this.source !== items) {
+			return; // Not indexed yet; the next lookup builds the index
+		}
+		const item = items[index];
+		const other = items[otherIndex];
+		if (item) {
+			this.positions.set(item.id, index);
+		}
+		if (other) {
+			this.positions.set(other.id, otherIndex);
+		}
+	}
+
+	private rebuild(items: T[]): void {
+		this.positions.clear();
+		items.forEach((item, index) => this.positions.set(item.id, index));
+		this.source = items;
+	}
+}
+
+/**
+ * Indexed view over the plugin settings with change events and write-behind persistence
+ */
+export class SettingsStore {
+	private commandIndex = new IdIndex<CommandTemplate>();
+	private agentIndex = new IdIndex<AgentConfig>();
+	private listeners = new Set<SettingsChangeListener>();
+	private saveTimer: ReturnType<typeof setTimeout> | null = null;
+	private dirty = false;
+	private writing: Promise<void> = Promise.resolve();
+
+	constructor(
+		private getSettings: () => AITerminalSettings,
+		private persist: (settings: AITerminalSettings) => Promise<void>,
+		private saveDelayMs: number = DEFAULT_SAVE_DELAY_MS
+	) {}
+
+	getCommand(id: string): CommandTemplate | undefined {
+		const commands = this.getSettings().commands;
+		return commands[this.commandIndex.indexOf(commands, id)];
+	}
+
+	/**
+	 * Position of a command in the settings list, or -1 if not found
+	 */
+	getCommandIndex(id: string): number {
+		return this.commandIndex.indexOf(this.getSettings().commands, id);
+	}
+
+	/**
+	 * Swap two commands in place, keeping the index current without a rebuild
+	 */
+	swapCommands(index: number, otherIndex: number): void {
+		const commands = this.getSettings().commands;
+		const current = commands[index];
+		const other = commands[otherIndex];
+		if (!current || !other) {
+			return;
+		}
+
+		commands[index] = other;
+		commands[otherIndex] = current;
+		this.commandIndex.swap(commands, index, otherIndex);
+		this.update({scope: "commands"});
+	}
+
+	getAgent(id: string): AgentConfig | undefined {
+		const agents = this.getSettings().agents;
+		return agents[this.agentIndex.indexOf(agents, id)];
+	}
+
+	/**
+	 * Subscribe to settings changes
+	 *
+	 * @returns Function that removes the listener.
+	 */
+	onChange(listener: SettingsChangeListener): () => void {
+		this.listeners.add(listener);
+		return () => this.listeners.delete(listener);
+	}
+
+	/**
+	 * Notify listeners of a change and schedule a coalesced write
+	 */
+	update(change: SettingsChange = {scope: "all"}): void {
+		this.dirty = true;
+		if (this.saveTimer !== null) {
+			clearTimeout(this.saveTimer);
+		}
+		this.saveTimer = setTimeout(() => {
+			void this.flush();
+		}, this.saveDelayMs);
+
+		this.listeners.forEach(listener => {
+			try {
+				listener(change);
+			} catch (error) {
+				console.error("[AI Terminal] Settings listener failed:", error);
+			}
+		});
+	}
+
+	/**
+	 * Write pending changes now; resolves once all writes have finished
+	 */
+	flush(): Promise<void> {
+		if (this.saveTimer !== null) {
+			clearTimeout(this.saveTimer);
+			this.saveTimer = null;
+		}
+		if (this.dirty) {
+			this.dirty = false;
+			// Chain writes so an older snapshot never lands after a newer one
+			this.writing = this.writing.then(() => this.persist(this.getSettings())).catch(error => {
+				this.dirty = true;
+				console.error("[AI Terminal] Failed to save settings:", error);
+			});
+		}
+		return this.writing;
+	}
+}
@@ -1,5 +1,6 @@
 import {describe, it, expect, vi} from "vitest";
-import {createDefaultSettings, loadSettings, resetSettingsToDefaults} from "./settings";
+import {App, PluginSettingTab} from "obsidian";
+import {AITerminalSettingTab, createDefaultSettings, loadSettings, resetSettingsToDefaults} from "./settings";
 import {AITerminalSettings} from "./types";
 
 describe("settings loading", () => {
@@ -105,7 +106,7 @@ describe("settings loading", () => {
 });
 
 describe("settings reset", () => {
-	it("restores defaults and saves settings", async () => {
+	it("restores defaults and saves settings", () => {
 		const defaults = createDefaultSettings();
 		const plugin = {
 			settings: {
@@ -116,12 +117,40 @@ describe("settings reset", () => {
 				rememberLastPrompt: true,
 				lastSavedPrompt: "Keep this"
 			} as AITerminalSettings,
-			saveSettings: vi.fn(async () => {})
+			saveSettings: vi.fn()
 		};
 
-		await resetSettingsToDefaults(plugin);
+		resetSettingsToDefaults(plugin);
 
 		expect(plugin.settings).toEqual(createDefaultSettings());
 		expect(plugin.saveSettings).toHaveBeenCalledTimes(1);
 	});
 });
+
+describe("settings tab", () => {
+	it("stops listening for settings changes and runs the base hide", () => {
+		const unsubscribe = vi.fn();
+		const plugin = {settingsStore: {onChange: vi.fn(() => unsubscribe)}};
+		const tab = new AITerminalSettingTab(new App(), plugin as any);
+		(tab as any).unsubscribeFromSettings = unsubscribe;
+		const baseHide = vi.spyOn(PluginSettingTab.prototype, "hide");
+
+		tab.hide();
+
+		expect(unsubscribe).toHaveBeenCalledTimes(1);
+		expect(baseHide).toHaveBeenCalledTimes(1);
+		baseHide.mockRestore();
+	});
+
+	it("applies a pool size still being edited when the tab closes", () => {
+		const plugin = {settingsStore: {onChange: vi.fn(() => vi.fn())}};
+		const tab = new AITerminalSettingTab(new App(), plugin as any);
+		const applyPoolSize = vi.fn();
+		(tab as any).applyPoolSize = applyPoolSize;
+
+		tab.hide();
+		tab.hide();
+
+		expect(applyPoolSize).toHaveBeenCalledTimes(1);
+	});
+});
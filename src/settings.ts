@@ -46,7 +46,13 @@ export const DEFAULT_SETTINGS: AITerminalSettings = {
 	lastUsedDirectPromptCommand: "opencode --agent <agent> --prompt <prompt>",
 	lastUsedDirectPromptAgentId: "00000000-0000-4000-8000-000000000001",
 	rememberLastPrompt: false,
-	lastSavedPrompt: ""
+	lastSavedPrompt: "",
+	payloadOffloadThreshold: 4000,
+	batchConcurrency: 2,
+	batchLaunchIntervalMs: 500,
+	sessionPoolSize: 0,
+	sessionPoolIdleTimeoutSeconds: 600,
+	debugLogging: false
 };
 
 export function createDefaultSettings(): AITerminalSettings {
@@ -57,9 +63,9 @@ export function createDefaultSettings(): AITerminalSettings {
 	};
 }
 
-export async function resetSettingsToDefaults(plugin: {settings: AITerminalSettings; saveSettings: () => Promise<void>}): Promise<void> {
+export function resetSettingsToDefaults(plugin: {settings: AITerminalSettings; saveSettings: () => void}): void {
 	plugin.settings = createDefaultSettings();
-	await plugin.saveSettings();
+	plugin.saveSettings();
 }
 
 function isValidUUID(id: string): boolean {
@@ -152,6 +158,9 @@ export class AITerminalSettingTab extends PluginSettingTab {
 	plugin: AITerminalPlugin;
 	private commandManager: CommandManager;
 	private agentListEditor: AgentListEditor;
+	private unsubscribeFromSettings: (() => void) | null = null;
+	/** Applies a pool size still being edited when the tab closes */
+	private applyPoolSize: (() => void) | null = null;
 
 	constructor(app: App, plugin: AITerminalPlugin) {
 		super(app, plugin);
@@ -165,6 +174,16 @@ export class AITerminalSettingTab extends PluginSettingTab {
 
 		containerEl.empty();
 
+		// Settings load after the workspace layout is ready
+		if (!this.plugin.isReady()) {
+			containerEl.createEl("p", {
+				text: "Loading settings...",
+				cls: "setting-item-description"
+			});
+			void this.plugin.whenReady().then(() => this.display(), () => {});
+			return;
+		}
+
 		new Setting(containerEl)
 			.setName("Terminal configuration")
 			.setHeading();
@@ -176,9 +195,44 @@ export class AITerminalSettingTab extends PluginSettingTab {
 			.addDropdown(dropdown => dropdown
 				.addOption("windows-terminal", "Windows terminal")
 				.setValue(this.plugin.settings.terminalType)
-				.onChange(async (value: PlatformType) => {
+				.onChange((value: PlatformType) => {
 					this.plugin.settings.terminalType = value;
-					await this.plugin.saveSettings();
+					this.plugin.saveSettings();
+				}));
+
+		new Setting(containerEl)
+			.setName("Warm shell pool size")
+			.setDesc("Keep this many login shells pre-started so launches skip profile loading (macOS and Linux only, 0 disables)")
+			.addText(text => {
+				text
+					.setPlaceholder(String(DEFAULT_SETTINGS.sessionPoolSize))
+					.setValue(String(this.plugin.settings.sessionPoolSize));
+				const applyPoolSize = () => {
+					const size = Number(text.inputEl.value);
+					if (!Number.isInteger(size) || size < 0 || size === this.plugin.settings.sessionPoolSize) {
+						return;
+					}
+					this.plugin.settings.sessionPoolSize = size;
+					this.plugin.saveSettings();
+				};
+				// Resizing restarts the pooled shells, so apply on commit (Enter or leaving the field), not per keystroke
+				text.inputEl.addEventListener("change", applyPoolSize);
+				this.applyPoolSize = applyPoolSize;
+			});
+
+		new Setting(containerEl)
+			.setName("Warm shell idle timeout")
+			.setDesc("Close pre-started shells that have not been used for this many seconds")
+			.addText(text => text
+				.setPlaceholder(String(DEFAULT_SETTINGS.sessionPoolIdleTimeoutSeconds))
+				.setValue(String(this.plugin.settings.sessionPoolIdleTimeoutSeconds))
+				.onChange((value: string) => {
+					const seconds = Number(value);
+					if (!Number.isInteger(seconds) || seconds < 1) {
+						return;
+					}
+					this.plugin.settings.sessionPoolIdleTimeoutSeconds = seconds;
+					this.plugin.saveSettings();
 				}));
 
 		// Agent List Section
@@ -207,33 +261,162 @@ export class AITerminalSettingTab extends PluginSettingTab {
 						null,
 						this.plugin.settings.agents,
 						async (command) => {
-							await this.commandManager.addCommand(command);
-							this.display(); // Refresh settings
+							this.commandManager.addCommand(command);
 						}
 					);
 					modal.open();
 				}));
 
-		// Display existing commands
-		const commands = this.commandManager.getAllCommands();
+		// Display existing commands; only this list is re-rendered when commands change
+		const commandListEl = containerEl.createDiv();
+		this.renderCommandList(commandListEl);
+		this.unsubscribeFromSettings?.();
+		this.unsubscribeFromSettings = this.plugin.settingsStore.onChange(change => {
+			if (change.scope === "commands") {
+				this.renderCommandList(commandListEl);
+			}
+		});
+
+		// Direct Prompt Section
+		new Setting(containerEl)
+			.setName("Direct prompt")
+			.setHeading();
+
+		new Setting(containerEl)
+			.setName("Remember last prompt")
+			.setDesc("Store and restore the last direct prompt text (opt-in)")
+			.addToggle(toggle => toggle
+				.setValue(this.plugin.settings.rememberLastPrompt)
+				.onChange((value: boolean) => {
+				this.plugin.settings.rememberLastPrompt = value;
+				this.plugin.saveSettings();
+				}));
+
+		// Large Payloads Section
+		new Setting(containerEl)
+			.setName("Large payloads")
+			.setHeading();
+
+		new Setting(containerEl)
+			.setName("Offload threshold")
+			.setDesc("Selections or prompts longer than this many characters are written to a temporary file and read back by the shell, keeping them out of the terminal launch command (0 disables). The agent still receives the text as one argument, so use <selection-file> or <prompt-file> for very large text")
+			.addText(text => text
+				.setPlaceholder(String(DEFAULT_SETTINGS.payloadOffloadThreshold))
+				.setValue(String(this.plugin.settings.payloadOffloadThreshold))
+				.onChange((value: string) => {
+					const threshold = Number(value);
+					if (!Number.isInteger(threshold) || threshold < 0) {
+						return;
+					}
+					this.plugin.settings.payloadOffloadThreshold = threshold;
+					this.plugin.saveSettings();
+				}));
+
+		// Batch Execution Section
+		new Setting(containerEl)
+			.setName("Batch execution")
+			.setHeading();
+
+		new Setting(containerEl)
+			.setName("Max running agents")
+			.setDesc("How many agents a folder or multi-file batch may run at the same time; the next file starts when one exits (macOS and Linux only, Windows terminal launches are not capped)")
+			.addText(text => text
+				.setPlaceholder(String(DEFAULT_SETTINGS.batchConcurrency))
+				.setValue(String(this.plugin.settings.batchConcurrency))
+				.onChange((value: string) => {
+					const concurrency = Number(value);
+					if (!Number.isInteger(concurrency) || concurrency < 1) {
+						return;
+					}
+					this.plugin.settings.batchConcurrency = concurrency;
+					this.plugin.saveSettings();
+				}));
+
+		new Setting(containerEl)
+			.setName("Launch interval")
+			.setDesc("Minimum delay in milliseconds between batch launches. On Windows, terminals keep running independently after launch, so this is the only limit there")
+			.addText(text => text
+				.setPlaceholder(String(DEFAULT_SETTINGS.batchLaunchIntervalMs))
+				.setValue(String(this.plugin.settings.batchLaunchIntervalMs))
+				.onChange((value: string) => {
+					const interval = Number(value);
+					if (!Number.isInteger(interval) || interval < 0) {
+						return;
+					}
+					this.plugin.settings.batchLaunchIntervalMs = interval;
+					this.plugin.saveSettings();
+				}));
+
+		// Diagnostics Section
+		this.renderDiagnostics(containerEl);
+
+		// Placeholder Reference
+		const placeholderSection = containerEl.createDiv({cls: "ai-terminal-placeholder-reference"});
+		new Setting(placeholderSection)
+			.setName("Available placeholders")
+			.setHeading();
+		const placeholderList = placeholderSection.createEl("ul");
 		
+		AVAILABLE_PLACEHOLDERS.forEach(placeholder => {
+			const item = placeholderList.createEl("li");
+			item.createEl("code", {text: `<${placeholder.name}>`});
+			item.appendText(`: ${placeholder.description} `);
+			item.createEl("em", {text: `(e.g., ${placeholder.example})`});
+		});
+
+		// Reset Settings
+		containerEl.createEl("hr");
+		new Setting(containerEl)
+			.setName("Reset all settings")
+			.setDesc("Restore all agents, commands, and preferences to their defaults")
+			.addButton(button => button
+				.setButtonText("Reset all settings")
+				.setWarning()
+				.onClick(() => {
+					const modal = new ResetSettingsModal(
+						this.app,
+						() => {
+							resetSettingsToDefaults(this.plugin);
+							new Notice("Settings reset to defaults.");
+							this.display();
+						},
+						() => {
+							// no-op
+						}
+					);
+					modal.open();
+				}));
+	}
+
+	hide(): void {
+		this.applyPoolSize?.();
+		this.applyPoolSize = null;
+		this.unsubscribeFromSettings?.();
+		this.unsubscribeFromSettings = null;
+		super.hide();
+	}
+
+	private renderCommandList(listEl: HTMLElement): void {
+		listEl.empty();
+
+		const commands = this.commandManager.getAllCommands();
+
 		if (commands.length === 0) {
-			containerEl.createEl("p", {
+			listEl.createEl("p", {
 				text: "No command templates configured yet. Click 'add command' to create one.",
 				cls: "setting-item-description"
 			});
 		} else {
 			commands.forEach((command, index) => {
-				const setting = new Setting(containerEl)
+				const setting = new Setting(listEl)
 					.setName(command.name)
 					.setDesc(`ID: ${command.id} | Template: ${command.template.substring(0, 50)}${command.template.length > 50 ? "..." : ""}`);
 
 				// Enabled toggle
 				setting.addToggle(toggle => toggle
 					.setValue(command.enabled)
-					.onChange(async () => {
-						await this.commandManager.toggleCommand(command.id);
-						this.display();
+					.onChange(() => {
+						this.commandManager.toggleCommand(command.id);
 					}));
 
 				// Edit button
@@ -245,8 +428,7 @@ export class AITerminalSettingTab extends PluginSettingTab {
 							{...command},
 							this.plugin.settings.agents,
 							async (updated) => {
-								await this.commandManager.updateCommand(command.id, updated);
-								this.display();
+								this.commandManager.updateCommand(command.id, updated);
 							}
 						);
 						modal.open();
@@ -257,9 +439,8 @@ export class AITerminalSettingTab extends PluginSettingTab {
 					setting.addButton(button => button
 						.setIcon("up-chevron-glyph")
 						.setTooltip("Move up")
-						.onClick(async () => {
-							await this.commandManager.moveCommandUp(command.id);
-							this.display();
+						.onClick(() => {
+							this.commandManager.moveCommandUp(command.id);
 						}));
 				}
 
@@ -268,9 +449,8 @@ export class AITerminalSettingTab extends PluginSettingTab {
 					setting.addButton(button => button
 						.setIcon("down-chevron-glyph")
 						.setTooltip("Move down")
-						.onClick(async () => {
-							await this.commandManager.moveCommandDown(command.id);
-							this.display();
+						.onClick(() => {
+							this.commandManager.moveCommandDown(command.id);
 						}));
 				}
 
@@ -279,64 +459,70 @@ export class AITerminalSettingTab extends PluginSettingTab {
 					.setIcon("trash")
 					.setTooltip("Remove")
 					.setWarning()
-					.onClick(async () => {
-						await this.commandManager.removeCommand(command.id);
-						this.display();
+					.onClick(() => {
+						this.commandManager.removeCommand(command.id);
 					}));
 			});
 		}
+	}
 
-		// Direct Prompt Section
+	private renderDiagnostics(containerEl: HTMLElement): void {
 		new Setting(containerEl)
-			.setName("Direct prompt")
+			.setName("Diagnostics")
 			.setHeading();
 
 		new Setting(containerEl)
-			.setName("Remember last prompt")
-			.setDesc("Store and restore the last direct prompt text (opt-in)")
+			.setName("Debug logging")
+			.setDesc("Log full resolved commands to the developer console (slow for large selections)")
 			.addToggle(toggle => toggle
-				.setValue(this.plugin.settings.rememberLastPrompt)
-				.onChange(async (value: boolean) => {
-				this.plugin.settings.rememberLastPrompt = value;
-				await this.plugin.saveSettings();
+				.setValue(this.plugin.settings.debugLogging)
+				.onChange((value: boolean) => {
+					this.plugin.settings.debugLogging = value;
+					this.plugin.saveSettings();
 				}));
 
-		// Placeholder Reference
-		const placeholderSection = containerEl.createDiv({cls: "ai-terminal-placeholder-reference"});
-		new Setting(placeholderSection)
-			.setName("Available placeholders")
-			.setHeading();
-		const placeholderList = placeholderSection.createEl("ul");
-		
-		AVAILABLE_PLACEHOLDERS.forEach(placeholder => {
-			const item = placeholderList.createEl("li");
-			item.createEl("code", {text: `<${placeholder.name}>`});
-			item.appendText(`: ${placeholder.description} `);
-			item.createEl("em", {text: `(e.g., ${placeholder.example})`});
-		});
+		const {onloadMs, initializeMs} = this.plugin.startupTimings;
+		new Setting(containerEl)
+			.setName("Startup time")
+			.setDesc(
+				`Plugin load ${onloadMs.toFixed(1)} ms | deferred settings load ` +
+				(initializeMs === undefined ? "pending" : `${initializeMs.toFixed(1)} ms`)
+			);
 
-		// Reset Settings
-		containerEl.createEl("hr");
+		const metrics = this.plugin.launchMetrics;
 		new Setting(containerEl)
-			.setName("Reset all settings")
-			.setDesc("Restore all agents, commands, and preferences to their defaults")
+			.setName("Launch latency")
+			.setDesc("Timings of recent launches in this session (context collection, resolution, encoding, spawn)")
 			.addButton(button => button
-				.setButtonText("Reset all settings")
-				.setWarning()
+				.setButtonText("Copy as JSON")
+				.onClick(async () => {
+					await navigator.clipboard.writeText(metrics.toJSON());
+					new Notice("Launch timings copied to clipboard.");
+				}))
+			.addButton(button => button
+				.setButtonText("Clear")
 				.onClick(() => {
-					const modal = new ResetSettingsModal(
-						this.app,
-						async () => {
-							await resetSettingsToDefaults(this.plugin);
-							new Notice("Settings reset to defaults.");
-							this.display();
-						},
-						() => {
-							// no-op
-						}
-					);
-					modal.open();
+					metrics.clear();
+					this.display();
 				}));
+
+		const summaries = metrics.summarize();
+		if (summaries.length === 0) {
+			containerEl.createEl("p", {
+				text: "No launches recorded yet.",
+				cls: "setting-item-description"
+			});
+			return;
+		}
+
+		summaries.forEach(summary => {
+			new Setting(containerEl)
+				.setName(summary.commandName)
+				.setDesc(
+					`${summary.count} launches | p50 ${summary.p50Ms.toFixed(1)} ms | p95 ${summary.p95Ms.toFixed(1)} ms` +
+					` | payload avg ${summary.avgPayloadChars} / max ${summary.maxPayloadChars} chars`
+				);
+		});
 	}
 }
 
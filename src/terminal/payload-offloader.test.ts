@@ -0,0 +1,86 @@
+import {afterEach, beforeEach, describe, expect, it} from "vitest";
+import fs from "fs";
+import os from "os";
+import path from "path";
+import {exceedsArgumentLimit, MAX_PAYLOAD_AGE_MS, PayloadOffloader} from "./payload-offloader";
+
+describe("PayloadOffloader", () => {
+	let directory: string;
+	let offloader: PayloadOffloader;
+
+	beforeEach(() => {
+		directory = fs.mkdtempSync(path.join(os.tmpdir(), "ai-terminal-payloads-"));
+		offloader = new PayloadOffloader(() => directory);
+	});
+
+	afterEach(() => {
+		fs.rmSync(directory, {recursive: true, force: true});
+	});
+
+	it("writes payload content to a new file in the data dir", async () => {
+		const filePath = await offloader.write("selection", "line1\nIt's \"quoted\" ✓");
+
+		expect(path.dirname(filePath)).toBe(path.resolve(directory));
+		expect(path.basename(filePath)).toMatch(/^selection-\d+-[0-9a-f]{8}\.txt$/);
+		expect(fs.readFileSync(filePath, "utf8")).toBe("line1\nIt's \"quoted\" ✓");
+	});
+
+	it("removes payload files older than the max age", async () => {
+		const stale = await offloader.write("prompt", "old");
+		const fresh = await offloader.write("prompt", "new");
+		const past = new Date(Date.now() - MAX_PAYLOAD_AGE_MS - 1000);
+		fs.utimesSync(stale, past, past);
+
+		await offloader.cleanup();
+
+		expect(fs.existsSync(stale)).toBe(false);
+		expect(fs.existsSync(fresh)).toBe(true);
+	});
+
+	it("removes the oldest payload files once the directory exceeds the size cap", async () => {
+		const capped = new PayloadOffloader(() => directory, 10);
+		const oldest = await capped.write("selection", "aaaaaa");
+		const older = await capped.write("selection", "bbbbbb");
+		const newest = await capped.write("selection", "cccccc");
+		const backdate = (filePath: string, ms: number) => {
+			const time = new Date(Date.now() - ms);
+			fs.utimesSync(filePath, time, time);
+		};
+		backdate(oldest, 2 * 60 * 60 * 1000);
+		backdate(older, 60 * 60 * 1000);
+
+		await capped.cleanup();
+
+		expect(fs.existsSync(oldest)).toBe(false);
+		expect(fs.existsSync(older)).toBe(false);
+		expect(fs.existsSync(newest)).toBe(true);
+	});
+
+	it("keeps a just-written payload larger than the size cap", async () => {
+		const capped = new PayloadOffloader(() => directory, 10);
+		const large = await capped.write("prompt", "x".repeat(100));
+
+		await capped.cleanup();
+
+		expect(fs.existsSync(large)).toBe(true);
+	});
+
+	it("ignores a missing data dir during cleanup", async () => {
+		const missing = new PayloadOffloader(() => path.join(directory, "missing"));
+		await expect(missing.cleanup()).resolves.toBeUndefined();
+	});
+});
+
+describe("exceedsArgumentLimit", () => {
+	it("uses the per-argument byte limit on Linux", () => {
+		expect(exceedsArgumentLimit("a".repeat(128 * 1024), "linux")).toBe(false);
+		expect(exceedsArgumentLimit("a".repeat(128 * 1024 + 1), "linux")).toBe(true);
+		// Multi-byte characters count by their UTF-8 size
+		expect(exceedsArgumentLimit("✓".repeat(50000), "linux")).toBe(true);
+	});
+
+	it("uses the command-line character limit on Windows", () => {
+		expect(exceedsArgumentLimit("a".repeat(32767), "win32")).toBe(false);
+		expect(exceedsArgumentLimit("a".repeat(32768), "win32")).toBe(true);
+	});
+});
@@ -0,0 +1,112 @@
+import {PayloadKind} from "../types";
+import {generateUUID} from "../utils/uuid";
+
+// Use require for Node.js builtins to avoid import restrictions
+const fs = require("fs") as typeof import("fs");
+const path = require("path") as typeof import("path");
+
+/** Payload files older than this are removed during cleanup */
+export const MAX_PAYLOAD_AGE_MS = 24 * 60 * 60 * 1000;
+
+/** Oldest payload files are removed once the directory exceeds this size */
+export const MAX_PAYLOAD_DIR_BYTES = 100 * 1024 * 1024;
+
+/** Payload files younger than this are never removed, so a launching shell can still read them */
+export const MIN_PAYLOAD_AGE_MS = 60 * 1000;
+
+const CLEANUP_INTERVAL_MS = 60 * 1000;
+
+/** Linux caps a single argv string at 32 pages (MAX_ARG_STRLEN) */
+const LINUX_MAX_ARG_BYTES = 128 * 1024;
+
+/** Windows caps the whole CreateProcess command line at 32,767 UTF-16 characters */
+const WINDOWS_MAX_COMMAND_LINE_CHARS = 32767;
+
+/** macOS has no per-argument cap, only ARG_MAX for all arguments and the environment */
+const MACOS_MAX_ARGS_BYTES = 1024 * 1024;
+
+/**
+ * Check whether a payload read back by the shell is still too large to reach the
+ * agent as a single argument. Offloading keeps the text out of the terminal's own
+ * command line, but `$(cat ...)` / `Get-Content` still expand it into one argument.
+ */
+export function exceedsArgumentLimit(content: string, platform: NodeJS.Platform = process.platform): boolean {
+	if (platform === "win32") {
+		return content.length > WINDOWS_MAX_COMMAND_LINE_CHARS;
+	}
+	const limit = platform === "darwin" ? MACOS_MAX_ARGS_BYTES : LINUX_MAX_ARG_BYTES;
+	return Buffer.byteLength(content, "utf8") > limit;
+}
+
+/**
+ * Writes large selections/prompts to temp files so they stay out of argv
+ */
+export class PayloadOffloader {
+	private lastCleanup = 0;
+
+	constructor(
+		private getDirectory: () => string,
+		private maxDirectoryBytes: number = MAX_PAYLOAD_DIR_BYTES
+	) {}
+
+	/**
+	 * Write a payload to a new temp file
+	 *
+	 * @returns Absolute path of the written file.
+	 */
+	async write(kind: PayloadKind, content: string): Promise<string> {
+		const directory = path.resolve(this.getDirectory());
+		await fs.promises.mkdir(directory, {recursive: true});
+
+		const filePath = path.join(directory, `${kind}-${Date.now()}-${generateUUID().slice(0, 8)}.txt`);
+		await fs.promises.writeFile(filePath, content, "utf8");
+
+		const now = Date.now();
+		if (now - this.lastCleanup >= CLEANUP_INTERVAL_MS) {
+			this.lastCleanup = now;
+			void this.cleanup(now).catch(error => {
+				console.warn("[AI Terminal] Payload cleanup failed:", error);
+			});
+		}
+
+		return filePath;
+	}
+
+	/**
+	 * Remove expired payload files, then the oldest ones until the directory fits the size cap.
+	 * Files written in the last minute are kept even when they alone exceed the cap.
+	 */
+	async cleanup(now: number = Date.now()): Promise<void> {
+		const directory = path.resolve(this.getDirectory());
+		let names: string[];
+		try {
+			names = await fs.promises.readdir(directory);
+		} catch {
+			return; // Nothing written yet
+		}
+
+		const files: {filePath: string; size: number; mtimeMs: number}[] = [];
+		for (const name of names) {
+			const filePath = path.join(directory, name);
+			const stat = await fs.promises.stat(filePath);
+			if (!stat.isFile()) {
+				continue;
+			}
+			if (now - stat.mtimeMs > MAX_PAYLOAD_AGE_MS) {
+				await fs.promises.rm(filePath, {force: true});
+				continue;
+			}
+			files.push({filePath, size: stat.size, mtimeMs: stat.mtimeMs});
+		}
+
+		// Newest first, so the most recent launches keep their payloads
+		files.sort((a, b) => b.mtimeMs - a.mtimeMs);
+		let totalBytes = 0;
+		for (const file of files) {
+			totalBytes += file.size;
+			if (totalBytes > this.maxDirectoryBytes && now - file.mtimeMs >= MIN_PAYLOAD_AGE_MS) {
+				await fs.promises.rm(file.filePath, {force: true});
+			}
+		}
+	}
+}
@@ -0,0 +1,99 @@
+import {afterEach, beforeEach, describe, expect, it, vi} from "vitest";
+import {EventEmitter} from "events";
+import {ShellSessionPool, ShellSessionSpec} from "./shell-session-pool";
+
+class FakeChild extends EventEmitter {
+	stdin = Object.assign(new EventEmitter(), {end: vi.fn()});
+	kill = vi.fn(() => {
+		this.emit("exit");
+		return true;
+	});
+	unref = vi.fn();
+}
+
+const spec: ShellSessionSpec = {shell: "/bin/zsh", workingDir: "/vault"};
+
+describe("ShellSessionPool", () => {
+	let children: FakeChild[];
+	let options: {size: number; idleTimeoutMs: number};
+	let pool: ShellSessionPool;
+
+	beforeEach(() => {
+		vi.useFakeTimers();
+		children = [];
+		options = {size: 2, idleTimeoutMs: 1000};
+		pool = new ShellSessionPool(() => options, () => {
+			const child = new FakeChild();
+			children.push(child);
+			return child as any;
+		});
+	});
+
+	afterEach(() => {
+		pool.dispose();
+		vi.useRealTimers();
+	});
+
+	it("falls back to a fresh spawn when the pool is cold, then refills it", () => {
+		expect(pool.dispatch(spec, "copilot -i 'hi'")).toBeUndefined();
+		vi.advanceTimersByTime(0);
+
+		expect(children).toHaveLength(2);
+	});
+
+	it("dispatches the command into an idle session and refills in the background", () => {
+		pool.warm(spec);
+		expect(pool.dispatch(spec, "copilot -i 'hi'")).toBe(children[0]);
+
+		expect(children[0]?.stdin.end).toHaveBeenCalledWith("copilot -i 'hi'\n");
+		expect(children[0]?.unref).toHaveBeenCalled();
+
+		vi.advanceTimersByTime(0);
+		expect(children).toHaveLength(3);
+	});
+
+	it("does not use the pool when its size is 0", () => {
+		options.size = 0;
+		pool.warm(spec);
+
+		expect(children).toHaveLength(0);
+		expect(pool.dispatch(spec, "echo")).toBeUndefined();
+	});
+
+	it("kills sessions that stay idle past the timeout", () => {
+		pool.warm(spec);
+		vi.advanceTimersByTime(1000);
+
+		expect(children.every(child => child.kill.mock.calls.length === 1)).toBe(true);
+		expect(pool.dispatch(spec, "echo")).toBeUndefined();
+	});
+
+	it("drops sessions that exit on their own", () => {
+		pool.warm(spec);
+		children[0]?.emit("exit");
+		children[1]?.emit("exit");
+
+		expect(pool.dispatch(spec, "echo")).toBeUndefined();
+	});
+
+	it("kills idle sessions on dispose and stops refilling", () => {
+		pool.warm(spec);
+		pool.dispose();
+		pool.warm(spec);
+
+		expect(children).toHaveLength(2);
+		expect(children.every(child => child.kill.mock.calls.length === 1)).toBe(true);
+	});
+
+	it("kills idle sessions on clear and refills with the current size", () => {
+		pool.warm(spec);
+		pool.clear();
+		expect(children.every(child => child.kill.mock.calls.length === 1)).toBe(true);
+
+		options.size = 1;
+		pool.warm(spec);
+		expect(children).toHaveLength(3);
+		expect(pool.dispatch(spec, "echo")).toBe(children[2]);
+		expect(children[2]?.stdin.end).toHaveBeenCalledWith("echo\n");
+	});
+});
@@ -0,0 +1,154 @@
+// Use require for Node.js builtin to avoid import restrictions
+const {spawn} = require("child_process") as { spawn: typeof import("child_process").spawn };
+
+type ChildProcess = import("child_process").ChildProcess;
+
+/**
+ * Shell and working directory a pooled session is started with
+ */
+export interface ShellSessionSpec {
+	shell: string;
+	workingDir: string;
+}
+
+export interface ShellSessionPoolOptions {
+	/** Idle sessions kept per shell and working directory (0 disables the pool) */
+	size: number;
+
+	/** Idle sessions are killed after this long, in milliseconds */
+	idleTimeoutMs: number;
+}
+
+interface PooledSession {
+	child: ChildProcess;
+	idleTimer: ReturnType<typeof setTimeout>;
+	onExit: () => void;
+}
+
+/**
+ * Spawn a login shell that sources its profile, then waits for commands on stdin
+ */
+const spawnLoginShell = (spec: ShellSessionSpec): ChildProcess => spawn(spec.shell, ["-l"], {
+	cwd: spec.workingDir,
+	detached: true,
+	stdio: ["pipe", "ignore", "ignore"]
+});
+
+/**
+ * Keeps pre-spawned, pre-initialised login shells ready for dispatching commands
+ */
+export class ShellSessionPool {
+	private sessions = new Map<string, PooledSession[]>();
+	private disposed = false;
+
+	constructor(
+		private getOptions: () => ShellSessionPoolOptions,
+		private spawnSession: (spec: ShellSessionSpec) => ChildProcess = spawnLoginShell
+	) {}
+
+	/**
+	 * Run a command in an idle session, refilling the pool in the background.
+	 *
+	 * @returns The session's shell process if it took the command, undefined if the caller should spawn a shell.
+	 */
+	dispatch(spec: ShellSessionSpec, command: string): ChildProcess | undefined {
+		if (this.getOptions().size <= 0) {
+			return undefined;
+		}
+
+		const session = this.sessions.get(this.getKey(spec))?.shift();
+		setTimeout(() => this.warm(spec), 0);
+		if (!session) {
+			return undefined;
+		}
+
+		this.release(session);
+		const logError = (error: Error) => console.error("[AI Terminal] Pooled shell error:", error);
+		session.child.once("error", logError);
+		session.child.stdin?.once("error", logError);
+		// The shell exits after running the command and reaching end of input
+		session.child.stdin?.end(`${command}\n`);
+		session.child.unref();
+		return session.child;
+	}
+
+	/**
+	 * Spawn sessions until the pool for this spec is full
+	 */
+	warm(spec: ShellSessionSpec): void {
+		if (this.disposed) {
+			return;
+		}
+		const {size} = this.getOptions();
+		const key = this.getKey(spec);
+		const sessions = this.sessions.get(key) ?? [];
+		this.sessions.set(key, sessions);
+
+		while (sessions.length < size) {
+			let child: ChildProcess;
+			try {
+				child = this.spawnSession(spec);
+			} catch (error) {
+				console.warn("[AI Terminal] Failed to spawn pooled shell:", error);
+				return;
+			}
+			sessions.push(this.track(key, child));
+		}
+	}
+
+	/**
+	 * Kill all idle sessions and stop refilling
+	 */
+	dispose(): void {
+		this.disposed = true;
+		this.clear();
+	}
+
+	/**
+	 * Kill all idle sessions; later warm calls refill the pool with the current options
+	 */
+	clear(): void {
+		this.sessions.forEach(sessions => {
+			sessions.forEach(session => {
+				this.release(session);
+				session.child.kill();
+			});
+		});
+		this.sessions.clear();
+	}
+
+	private track(key: string, child: ChildProcess): PooledSession {
+		const remove = () => {
+			const sessions = this.sessions.get(key);
+			const index = sessions?.indexOf(session) ?? -1;
+			if (sessions && index !== -1) {
+				sessions.splice(index, 1);
+			}
+			this.release(session);
+		};
+		const session: PooledSession = {
+			child,
+			idleTimer: setTimeout(() => {
+				remove();
+				child.kill();
+			}, this.getOptions().idleTimeoutMs),
+			onExit: remove
+		};
+		child.once("exit", remove);
+		child.once("error", remove);
+		return session;
+	}
+
+	/**
+	 * Stop tracking a session without killing it
+	 */
+	private release(session: PooledSession): void {
+		clearTimeout(session.idleTimer);
+		session.child.removeListener("exit", session.onExit);
+		session.child.removeListener("error", session.onExit);
+	}
+
+	private getKey(spec: ShellSessionSpec): string {
+		return `${spec.shell}\u0000${spec.workingDir}`;
+	}
+}
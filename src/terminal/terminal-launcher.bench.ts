@@ -0,0 +1,36 @@
+import {bench, describe, vi} from "vitest";
+import {TerminalLauncher} from "./terminal-launcher";
+import {createSelection, getBenchOptions, PAYLOAD_SIZES} from "../__bench__/fixtures";
+
+interface LauncherInternals {
+	wrapPowerShellScript(script: string, workingDir: string): string;
+	encodeCommandForPowerShell(command: string): string;
+}
+
+type SpawnProcess = ConstructorParameters<typeof TerminalLauncher>[1];
+
+// Stand-in for child_process.spawn, so no process is started
+const stubSpawn = (() => ({unref: () => {}, once: () => {}})) as unknown as SpawnProcess;
+
+// Launch logs one line per call
+vi.spyOn(console, "log").mockImplementation(() => {});
+
+describe.each(PAYLOAD_SIZES)("PowerShell encoding (%s command)", (_label, length) => {
+	const launcher = new TerminalLauncher() as unknown as LauncherInternals;
+	const command = `copilot -i "${createSelection(length)}"`;
+
+	bench("wrap + encodeCommandForPowerShell", () => {
+		launcher.encodeCommandForPowerShell(launcher.wrapPowerShellScript(command, "C:\\obsidian\\vault"));
+	}, getBenchOptions(length));
+});
+
+describe.each(PAYLOAD_SIZES)("launch with stubbed spawn (%s command)", (_label, length) => {
+	const launcher = new TerminalLauncher(undefined, stubSpawn);
+	const command = `copilot -i "${createSelection(length)}"`;
+	// Windows Terminal runs the encoding path; other platforms spawn the shell directly
+	const terminalType = process.platform === "win32" ? "windows-terminal" : "bash";
+
+	bench("launch", async () => {
+		await launcher.launch(terminalType, command, "/tmp");
+	}, getBenchOptions(length));
+});
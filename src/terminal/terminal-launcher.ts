@@ -1,29 +1,92 @@
 import {Notice} from "obsidian";
 import {PlatformType} from "../types";
 import {resolveShellType} from "./shell-selector";
+import {ShellSessionPool, ShellSessionSpec} from "./shell-session-pool";
+import {debugLog} from "../utils/debug-log";
 
 // Use require for Node.js builtin to avoid import restrictions
 const {spawn} = require("child_process") as { spawn: typeof import("child_process").spawn };
 
+/**
+ * Phase timings measured while launching, in milliseconds
+ */
+export interface LaunchTimings {
+	/** PowerShell script wrapping and Base64 encoding */
+	encodeMs?: number;
+
+	/** Synchronous spawn (or pooled dispatch) call */
+	spawnMs: number;
+
+	/** Resolves with the time from the spawn call until the OS process started */
+	ready?: Promise<number>;
+
+	/**
+	 * Resolves when the shell running the command exits. Only set for POSIX shells,
+	 * including pooled ones; Windows Terminal hands the command to a separate process.
+	 */
+	exited?: Promise<void>;
+}
+
+const whenSpawned = (child: import("child_process").ChildProcess, spawnStart: number): Promise<number> =>
+	new Promise(resolve => {
+		child.once("spawn", () => resolve(performance.now() - spawnStart));
+	});
+
+const whenExited = (child: import("child_process").ChildProcess): Promise<void> =>
+	new Promise(resolve => {
+		child.once("exit", () => resolve());
+		child.once("error", () => resolve());
+	});
+
 /**
  * Platform-specific terminal launcher
  */
 export class TerminalLauncher {
+	constructor(
+		private sessionPool?: ShellSessionPool,
+		private spawnProcess: typeof spawn = spawn
+	) {}
+
+	/**
+	 * Pre-spawn pooled shells for the given terminal type and working directory
+	 */
+	warm(terminalType: PlatformType, workingDir: string): void {
+		const spec = this.getPooledShellSpec(terminalType, workingDir);
+		if (spec) {
+			this.sessionPool?.warm(spec);
+		}
+	}
+
+	/**
+	 * Kill pooled shells
+	 */
+	dispose(): void {
+		this.sessionPool?.dispose();
+	}
+
+	/**
+	 * Kill idle pooled shells but keep the pool usable for the next warm call
+	 */
+	reset(): void {
+		this.sessionPool?.clear();
+	}
+
 	/**
 	 * Launch terminal with command
+	 *
+	 * @returns Timings of the encode/spawn phases measured by the launcher.
 	 */
 	async launch(
 		terminalType: PlatformType,
 		command: string,
 		workingDir: string
-	): Promise<void> {
+	): Promise<LaunchTimings> {
 		try {
 			const platform = process.platform;
 			if (platform === "win32" && terminalType === "windows-terminal") {
-				await this.launchWindowsTerminal(command, workingDir);
-				return;
+				return await this.launchWindowsTerminal(command, workingDir);
 			}
-			await this.launchPosixShell(terminalType, command, workingDir);
+			return await this.launchPosixShell(terminalType, command, workingDir);
 		} catch (error) {
 			const message = error instanceof Error ? error.message : String(error);
 			new Notice(`Failed to launch terminal: ${message}`);
@@ -53,26 +116,30 @@ export class TerminalLauncher {
 	/**
 	 * Launch Windows Terminal
 	 */
-	private async launchWindowsTerminal(command: string, workingDir: string): Promise<void> {
+	private async launchWindowsTerminal(command: string, workingDir: string): Promise<LaunchTimings> {
 		try {
 			// Use Base64 encoding to avoid all escaping issues
+			const encodeStart = performance.now();
 			const script = this.wrapPowerShellScript(command, workingDir);
 			const encodedCommand = this.encodeCommandForPowerShell(script);
+			const encodeMs = performance.now() - encodeStart;
 			
 			const args = [
 				"-d", workingDir,
 				"powershell", "-NoExit", "-EncodedCommand", encodedCommand
 			];
 
-			console.log("[AI Terminal] Launching Windows Terminal:");
-			console.log("  Working dir:", workingDir);
-			console.log("  Command:", command);
-			// console.log("  Encoded (Base64):", encodedCommand);
+			console.log(`[AI Terminal] Launching Windows Terminal (${command.length} chars)`);
+			debugLog("  Working dir:", workingDir);
+			debugLog("  Command:", command);
 
-			spawn("wt.exe", args, {
+			const spawnStart = performance.now();
+			const child = this.spawnProcess("wt.exe", args, {
 				detached: true,
 				stdio: "ignore"
-			}).unref();
+			});
+			child.unref();
+			return {encodeMs, spawnMs: performance.now() - spawnStart, ready: whenSpawned(child, spawnStart)};
 		} catch {
 			throw new Error(`Windows Terminal not found. Please install Windows Terminal or use a different terminal type.`);
 		}
@@ -82,26 +149,58 @@ export class TerminalLauncher {
 		terminalType: PlatformType,
 		command: string,
 		workingDir: string
-	): Promise<void> {
+	): Promise<LaunchTimings> {
 		const platform = process.platform;
 		const shellType = resolveShellType(terminalType, platform);
-		const shell = terminalType === "bash"
-			? "bash"
-			: (platform === "win32" ? "powershell" : (process.env.SHELL || "sh"));
+		const shell = this.getShell(terminalType, platform);
+
+		const spawnStart = performance.now();
+		const spec = this.getPooledShellSpec(terminalType, workingDir);
+		const pooled = spec ? this.sessionPool?.dispatch(spec, command) : undefined;
+		if (pooled) {
+			console.log(`[AI Terminal] Dispatched command to pooled ${shell} (${command.length} chars)`);
+			debugLog("  Working dir:", workingDir);
+			debugLog("  Command:", command);
+			return {spawnMs: performance.now() - spawnStart, exited: whenExited(pooled)};
+		}
+
 		const args = shellType === "powershell"
 			? ["-NoExit", "-Command", command]
 			: ["-lc", command];
 
-		console.log("[AI Terminal] Launching shell command:");
-		console.log("  Shell:", shell);
-		console.log("  Working dir:", workingDir);
-		console.log("  Command:", command);
+		console.log(`[AI Terminal] Launching ${shell} (${command.length} chars)`);
+		debugLog("  Working dir:", workingDir);
+		debugLog("  Command:", command);
 
-		spawn(shell, args, {
+		const child = this.spawnProcess(shell, args, {
 			cwd: workingDir,
 			detached: true,
 			stdio: "ignore"
-		}).unref();
+		});
+		child.unref();
+		return {
+			spawnMs: performance.now() - spawnStart,
+			ready: whenSpawned(child, spawnStart),
+			exited: whenExited(child)
+		};
 	}
 
+	private getShell(terminalType: PlatformType, platform: NodeJS.Platform): string {
+		if (terminalType === "bash") {
+			return "bash";
+		}
+		return platform === "win32" ? "powershell" : (process.env.SHELL || "sh");
+	}
+
+	/**
+	 * Only POSIX shells are pooled: they run headless and read commands from stdin.
+	 * Windows launches get a fresh console for the interactive agent, so they always spawn.
+	 */
+	private getPooledShellSpec(terminalType: PlatformType, workingDir: string): ShellSessionSpec | undefined {
+		const platform = process.platform;
+		if (platform === "win32") {
+			return undefined;
+		}
+		return {shell: this.getShell(terminalType, platform), workingDir};
+	}
 }
@@ -69,8 +69,51 @@ export interface AITerminalSettings {
 
 	/** Last saved prompt text (when remember is enabled) */
 	lastSavedPrompt: string;
+
+	/** Selections/prompts longer than this (characters) are written to temp files; 0 disables */
+	payloadOffloadThreshold: number;
+
+	/** Maximum number of batch agents running at once; only enforced where the shell's exit is observable (macOS/Linux) */
+	batchConcurrency: number;
+
+	/** Minimum delay between batch launches, in milliseconds */
+	batchLaunchIntervalMs: number;
+
+	/** Pre-spawned shells kept per shell and working directory; 0 disables the pool */
+	sessionPoolSize: number;
+
+	/** Idle pooled shells are closed after this many seconds */
+	sessionPoolIdleTimeoutSeconds: number;
+
+	/** Log full resolved commands and other verbose details to the console */
+	debugLogging: boolean;
 }
 
+/**
+ * Payloads that can be offloaded to temp files
+ */
+export type PayloadKind = "selection" | "prompt" | "manifest" | RichPlaceholder;
+
+/**
+ * Absolute temp file paths for offloaded payloads
+ */
+export type PayloadFiles = Partial<Record<PayloadKind, string>>;
+
+/**
+ * Placeholders backed by note content and metadata
+ */
+export type RichPlaceholder = "content" | "frontmatter" | "tags" | "links" | "backlinks";
+
+/**
+ * Preloaded rich placeholder values for the current file
+ */
+export type NoteContext = Partial<Record<RichPlaceholder, string>>;
+
+/**
+ * Rich placeholders, loaded only when a template references them
+ */
+export const RICH_PLACEHOLDERS: RichPlaceholder[] = ["content", "frontmatter", "tags", "links", "backlinks"];
+
 /**
  * Execution context for command resolution
  */
@@ -89,6 +132,18 @@ export interface ExecutionContext {
 	
 	/** Override default agent */
 	agent?: string;
+
+	/** Temp files holding offloaded selection, prompt and rich placeholder payloads */
+	payloadFiles?: PayloadFiles;
+
+	/** Prompt with nested placeholders already rendered, so it is only rendered once per launch */
+	resolvedPrompt?: string;
+
+	/** Rich placeholder values loaded for the current file */
+	noteContext?: NoteContext;
+
+	/** Files of a single-invocation batch, listed in the <manifest-file> */
+	batchFiles?: TFile[];
 }
 
 /**
@@ -144,9 +199,60 @@ export const AVAILABLE_PLACEHOLDERS: PlaceholderInfo[] = [
 		description: "Prompt text (uses default if not specified)",
 		example: "Fix issues in readme.md"
 	},
+	{
+		name: "content",
+		description: "Full note content",
+		example: "# Readme\nWelcome to the vault..."
+	},
+	{
+		name: "frontmatter",
+		description: "Note frontmatter as JSON",
+		example: "{\"title\":\"Readme\",\"tags\":[\"docs\"]}"
+	},
+	{
+		name: "tags",
+		description: "Note tags (frontmatter and inline), space-separated",
+		example: "#docs #todo"
+	},
+	{
+		name: "links",
+		description: "Vault-relative paths of notes this note links to, one per line",
+		example: "notes/setup.md"
+	},
+	{
+		name: "backlinks",
+		description: "Vault-relative paths of notes linking to this note, one per line",
+		example: "index.md"
+	},
+	{
+		name: "manifest-file",
+		description: "Path to a temp file listing the batch's files, one per line (runs the command once for the whole batch)",
+		example: "/home/user/vault/.obsidian/plugins/ai-terminal/payloads/manifest-1700000000000-1a2b3c4d.txt"
+	},
+	{
+		name: "selection-file",
+		description: "Path to a temp file containing the selected text",
+		example: "/home/user/vault/.obsidian/plugins/ai-terminal/payloads/selection-1700000000000-1a2b3c4d.txt"
+	},
+	{
+		name: "prompt-file",
+		description: "Path to a temp file containing the resolved prompt",
+		example: "/home/user/vault/.obsidian/plugins/ai-terminal/payloads/prompt-1700000000000-1a2b3c4d.txt"
+	},
 	{
 		name: "agent",
 		description: "Agent name",
 		example: "copilot"
 	}
 ];
+
+/**
+ * Plugin startup durations, in milliseconds
+ */
+export interface StartupTimings {
+	/** Time spent in onload registering stubs */
+	onloadMs: number;
+
+	/** Deferred settings load, migration and template command registration */
+	initializeMs?: number;
+}
@@ -33,7 +33,7 @@ export class AgentListEditor {
 						this.plugin.settings.agents,
 						async (agent) => {
 							this.plugin.settings.agents.push(agent);
-							await this.plugin.saveSettings();
+							this.plugin.saveSettings();
 							onChange();
 						}
 					);
@@ -55,9 +55,9 @@ export class AgentListEditor {
 
 			setting.addToggle(toggle => toggle
 				.setValue(agent.enabled)
-				.onChange(async (value) => {
+				.onChange((value) => {
 					agent.enabled = value;
-					await this.plugin.saveSettings();
+					this.plugin.saveSettings();
 					onChange();
 				}));
 
@@ -70,7 +70,7 @@ export class AgentListEditor {
 						this.plugin.settings.agents.filter((_, currentIndex) => currentIndex !== index),
 						async (updated) => {
 							this.plugin.settings.agents[index] = updated;
-							await this.plugin.saveSettings();
+							this.plugin.saveSettings();
 							onChange();
 						}
 					);
@@ -81,13 +81,13 @@ export class AgentListEditor {
 				setting.addButton(button => button
 					.setIcon("up-chevron-glyph")
 					.setTooltip("Move up")
-					.onClick(async () => {
+					.onClick(() => {
 						const [current] = this.plugin.settings.agents.splice(index, 1);
 						if (!current) {
 							return;
 						}
 						this.plugin.settings.agents.splice(index - 1, 0, current);
-						await this.plugin.saveSettings();
+						this.plugin.saveSettings();
 						onChange();
 					}));
 			}
@@ -96,13 +96,13 @@ export class AgentListEditor {
 				setting.addButton(button => button
 					.setIcon("down-chevron-glyph")
 					.setTooltip("Move down")
-					.onClick(async () => {
+					.onClick(() => {
 						const [current] = this.plugin.settings.agents.splice(index, 1);
 						if (!current) {
 							return;
 						}
 						this.plugin.settings.agents.splice(index + 1, 0, current);
-						await this.plugin.saveSettings();
+						this.plugin.saveSettings();
 						onChange();
 					}));
 			}
@@ -111,17 +111,17 @@ export class AgentListEditor {
 				.setIcon("trash")
 				.setTooltip("Remove")
 				.setWarning()
-				.onClick(async () => {
-					await this.handleDeleteAgent(agent);
+				.onClick(() => {
+					this.handleDeleteAgent(agent);
 					onChange();
 				}));
 		});
 	}
 
-	private async handleDeleteAgent(agent: AgentConfig): Promise<void> {
+	private handleDeleteAgent(agent: AgentConfig): void {
 		const affectedTemplates = this.getTemplatesUsingAgent(agent.id);
 		if (affectedTemplates.length === 0) {
-			await this.deleteAgent(agent.id);
+			this.deleteAgent(agent.id);
 			return;
 		}
 		const templateList = affectedTemplates.map(template => template.name).join(", ");
@@ -131,9 +131,9 @@ export class AgentListEditor {
 		);
 	}
 
-	private async deleteAgent(agentId: string): Promise<void> {
+	private deleteAgent(agentId: string): void {
 		this.plugin.settings.agents = this.plugin.settings.agents.filter(agent => agent.id !== agentId);
-		await this.plugin.saveSettings();
+		this.plugin.saveSettings();
 		new Notice("Agent deleted");
 	}
 
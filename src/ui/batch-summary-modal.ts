@@ -0,0 +1,51 @@
+import {App, Modal, TFile} from "obsidian";
+import {ScheduledResult} from "../commands/batch-scheduler";
+
+const STATUS_LABELS: Record<ScheduledResult<TFile>["status"], string> = {
+	fulfilled: "Launched",
+	rejected: "Failed",
+	cancelled: "Cancelled"
+};
+
+/**
+ * Per-file summary shown when a batch finishes
+ */
+export class BatchSummaryModal extends Modal {
+	constructor(
+		app: App,
+		private commandName: string,
+		private results: ScheduledResult<TFile>[]
+	) {
+		super(app);
+	}
+
+	onOpen() {
+		const {contentEl} = this;
+		contentEl.empty();
+		contentEl.createEl("h2", {text: `Batch: ${this.commandName}`});
+
+		const count = (status: ScheduledResult<TFile>["status"]) =>
+			this.results.filter(result => result.status === status).length;
+		contentEl.createEl("p", {
+			text: `${count("fulfilled")} launched, ${count("rejected")} failed, ${count("cancelled")} cancelled`
+		});
+
+		const list = contentEl.createEl("ul", {cls: "ai-terminal-batch-summary"});
+		this.results.forEach(result => {
+			const item = list.createEl("li", {cls: `ai-terminal-batch-${result.status}`});
+			item.createEl("code", {text: result.item.path});
+			item.appendText(` ${STATUS_LABELS[result.status]}`);
+			if (result.status === "rejected") {
+				item.appendText(`: ${result.error}`);
+			}
+		});
+
+		const buttonContainer = contentEl.createDiv({cls: "modal-button-container"});
+		const closeButton = buttonContainer.createEl("button", {text: "Close", cls: "mod-cta"});
+		closeButton.addEventListener("click", () => this.close());
+	}
+
+	onClose() {
+		this.contentEl.empty();
+	}
+}
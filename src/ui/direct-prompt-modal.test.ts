@@ -19,10 +19,12 @@ const createPlugin = () => {
 	};
 	const settings = createDefaultSettings();
 	settings.agents = [{id: "00000000-0000-4000-8000-000000000001", name: "Build", enabled: true}];
+	const executor = {executeCommand: vi.fn(async () => true)};
 	return {
 		app,
 		settings,
-		saveSettings: vi.fn(async () => {})
+		saveSettings: vi.fn(),
+		getCommandExecutor: vi.fn(() => executor)
 	};
 };
 
@@ -75,7 +77,6 @@ describe("DirectPromptModal", () => {
 		(modal as any).promptText = "Fix the bug";
 		(modal as any).selectedAgentId = "00000000-0000-4000-8000-000000000001";
 		(modal as any).commandTemplate = "<agent> -i <prompt>";
-		(modal as any).commandExecutor = { executeCommand: vi.fn(async () => true) };
 
 		await (modal as any).executePrompt([
 			{id: "00000000-0000-4000-8000-000000000001", name: "Build", enabled: true}
@@ -83,6 +84,7 @@ describe("DirectPromptModal", () => {
 
 		expect(plugin.settings.lastSavedPrompt).toBe("Fix the bug");
 		expect(plugin.saveSettings).toHaveBeenCalledTimes(1);
+		expect(plugin.getCommandExecutor().executeCommand).toHaveBeenCalledTimes(1);
 	});
 
 	it("inserts placeholder value at cursor position", () => {
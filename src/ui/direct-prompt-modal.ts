@@ -1,12 +1,10 @@
 import {App, Modal, Notice, Setting, TFile} from "obsidian";
 import AITerminalPlugin from "../main";
 import {AgentConfig} from "../types";
-import {CommandExecutor} from "../commands/command-executor";
 import {ContextCollector} from "../placeholders/context-collector";
 import {createDirectPromptCommand} from "./direct-prompt-utils";
 
 export class DirectPromptModal extends Modal {
-	private commandExecutor: CommandExecutor;
 	private contextCollector: ContextCollector;
 	private commandTemplate = "";
 	private selectedAgentId = "";
@@ -24,8 +22,7 @@ export class DirectPromptModal extends Modal {
 		super(app);
 		this.selectedText = selection;
 		this.commandTemplate = plugin.settings.lastUsedDirectPromptCommand ?? "<agent> -i <prompt>";
-		this.commandExecutor = new CommandExecutor(plugin);
-		this.contextCollector = new ContextCollector(app);
+		this.contextCollector = new ContextCollector(app, plugin.noteContextCache);
 	}
 
 	onOpen() {
@@ -178,9 +175,9 @@ export class DirectPromptModal extends Modal {
 			this.promptText
 		);
 
-		await this.persistDirectPromptSettings();
+		this.persistDirectPromptSettings();
 
-		const success = await this.commandExecutor.executeCommand(directCommand, {
+		const success = await this.plugin.getCommandExecutor().executeCommand(directCommand, {
 			file: this.file,
 			selection: this.selectedText,
 			prompt: promptValue
@@ -191,13 +188,13 @@ export class DirectPromptModal extends Modal {
 		}
 	}
 
-	private async persistDirectPromptSettings(): Promise<void> {
+	private persistDirectPromptSettings(): void {
 		this.plugin.settings.lastUsedDirectPromptCommand = this.commandTemplate;
 		this.plugin.settings.lastUsedDirectPromptAgentId = this.selectedAgentId;
 		if (this.plugin.settings.rememberLastPrompt) {
 			this.plugin.settings.lastSavedPrompt = this.promptText;
 		}
-		await this.plugin.saveSettings();
+		this.plugin.saveSettings();
 	}
 
 	private insertPlaceholderValue(placeholder: string, savedStart: number | null = null, savedEnd: number | null = null): void {
@@ -0,0 +1,15 @@
+import {bench, describe} from "vitest";
+import {createDirectPromptCommand} from "./direct-prompt-utils";
+import {createCommandTemplates, createSelection, getBenchOptions, PAYLOAD_SIZES} from "../__bench__/fixtures";
+
+const templates = createCommandTemplates();
+
+describe.each(PAYLOAD_SIZES)("createDirectPromptCommand (%s prompt)", (_label, length) => {
+	const prompt = `  ${createSelection(length)}  `;
+	let next = 0;
+
+	bench("createDirectPromptCommand", () => {
+		const template = templates[next++ % templates.length] ?? "";
+		createDirectPromptCommand(template, "00000000-0000-4000-8000-000000000001", "Build", prompt);
+	}, getBenchOptions(length));
+});
@@ -0,0 +1,17 @@
+let debugEnabled = false;
+
+/**
+ * Enable or disable verbose debug logging
+ */
+export function setDebugLogging(enabled: boolean): void {
+	debugEnabled = enabled;
+}
+
+/**
+ * Log only when debug logging is enabled, so large values are never printed otherwise
+ */
+export function debugLog(...args: unknown[]): void {
+	if (debugEnabled) {
+		console.log("[AI Terminal]", ...args);
+	}
+}
@@ -0,0 +1,47 @@
+/**
+ * Minimal LRU cache backed by Map insertion order
+ */
+export class LruCache<K, V> {
+	private entries = new Map<K, V>();
+
+	constructor(private maxEntries: number) {}
+
+	get size(): number {
+		return this.entries.size;
+	}
+
+	/**
+	 * Get a value and mark it as most recently used
+	 */
+	get(key: K): V | undefined {
+		const value = this.entries.get(key);
+		if (value === undefined) {
+			return undefined;
+		}
+		this.entries.delete(key);
+		this.entries.set(key, value);
+		return value;
+	}
+
+	/**
+	 * Store a value, evicting the least recently used entry when full
+	 */
+	set(key: K, value: V): void {
+		this.entries.delete(key);
+		if (this.entries.size >= this.maxEntries) {
+			const oldest = this.entries.keys().next();
+			if (!oldest.done) {
+				this.entries.delete(oldest.value);
+			}
+		}
+		this.entries.set(key, value);
+	}
+
+	delete(key: K): void {
+		this.entries.delete(key);
+	}
+
+	clear(): void {
+		this.entries.clear();
+	}
+}
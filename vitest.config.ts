@@ -6,11 +6,14 @@ export default defineConfig({
 		globals: true,
 		environment: "node",
 		include: ["src/**/*.test.ts"],
+		benchmark: {
+			include: ["src/**/*.bench.ts"]
+		},
 		coverage: {
 			provider: "v8",
 			reporter: ["text", "html"],
 			include: ["src/**/*.ts"],
-			exclude: ["src/**/*.test.ts", "src/main.ts"]
+			exclude: ["src/**/*.test.ts", "src/**/*.bench.ts", "src/__bench__/**", "src/__tests__/**", "src/main.ts"]
 		}
 	},
 	resolve: {